@@ -0,0 +1,48 @@
+"""add google_media_items
+
+Revision ID: a1c3e5f7b901
+Revises:
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b901'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'google_media_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('media_item_id', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=500), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('base_url', sa.Text(), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('creation_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('media_metadata', sa.JSON(), nullable=True),
+        sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('media_item_id', 'category', name='uq_google_media_items_item_category'),
+    )
+    op.create_index(op.f('ix_google_media_items_id'), 'google_media_items', ['id'], unique=False)
+    op.create_index('ix_google_media_items_category_position', 'google_media_items', ['category', 'position'], unique=False)
+    op.create_index('ix_google_media_items_category_creation_time', 'google_media_items', ['category', 'creation_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_google_media_items_category_creation_time', table_name='google_media_items')
+    op.drop_index('ix_google_media_items_category_position', table_name='google_media_items')
+    op.drop_index(op.f('ix_google_media_items_id'), table_name='google_media_items')
+    op.drop_table('google_media_items')
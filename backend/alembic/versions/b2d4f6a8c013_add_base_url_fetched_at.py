@@ -0,0 +1,26 @@
+"""add base_url_fetched_at to google_media_items
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b901
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c013'
+down_revision = 'a1c3e5f7b901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('google_media_items', sa.Column('base_url_fetched_at', sa.DateTime(timezone=True), nullable=True))
+    # Existing baseUrls were issued by the crawl that last confirmed the row
+    op.execute('UPDATE google_media_items SET base_url_fetched_at = synced_at')
+
+
+def downgrade() -> None:
+    op.drop_column('google_media_items', 'base_url_fetched_at')
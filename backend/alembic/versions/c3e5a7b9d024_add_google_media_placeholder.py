@@ -0,0 +1,24 @@
+"""add placeholder to google_media_items
+
+Revision ID: c3e5a7b9d024
+Revises: b2d4f6a8c013
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d024'
+down_revision = 'b2d4f6a8c013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('google_media_items', sa.Column('placeholder', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('google_media_items', 'placeholder')
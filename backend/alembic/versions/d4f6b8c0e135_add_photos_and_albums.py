@@ -0,0 +1,66 @@
+"""add photos and albums
+
+Revision ID: d4f6b8c0e135
+Revises: c3e5a7b9d024
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e135'
+down_revision = 'c3e5a7b9d024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'albums',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('storage_type', sa.String(length=20), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('storage_type', 'category', name='uq_albums_storage_category'),
+    )
+    op.create_index(op.f('ix_albums_id'), 'albums', ['id'], unique=False)
+
+    op.create_table(
+        'photos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('album_id', sa.Integer(), nullable=True),
+        sa.Column('storage_type', sa.String(length=20), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('filename', sa.String(length=500), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('width', sa.Integer(), nullable=True),
+        sa.Column('height', sa.Integer(), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('mime_type', sa.String(length=100), nullable=True),
+        sa.Column('placeholder', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['album_id'], ['albums.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('storage_type', 'category', 'filename', name='uq_photos_storage_category_filename'),
+    )
+    op.create_index(op.f('ix_photos_id'), 'photos', ['id'], unique=False)
+    # Listing access paths: filter on storage_type (and category), order by created_at, id
+    op.create_index('ix_photos_storage_category_created_id', 'photos', ['storage_type', 'category', 'created_at', 'id'], unique=False)
+    op.create_index('ix_photos_storage_created_id', 'photos', ['storage_type', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_storage_created_id', table_name='photos')
+    op.drop_index('ix_photos_storage_category_created_id', table_name='photos')
+    op.drop_index(op.f('ix_photos_id'), table_name='photos')
+    op.drop_table('photos')
+    op.drop_index(op.f('ix_albums_id'), table_name='albums')
+    op.drop_table('albums')
@@ -0,0 +1,26 @@
+"""add photo search index
+
+Revision ID: e5a7c9d1f246
+Revises: d4f6b8c0e135
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.search_index import install_search_index, remove_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f246'
+down_revision = 'd4f6b8c0e135'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Weighted tsvector + GIN and pg_trgm on PostgreSQL, FTS5 on SQLite
+    install_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    remove_search_index(op.get_bind())
@@ -0,0 +1,35 @@
+"""add photo category stats
+
+Revision ID: f6b8d0e2a357
+Revises: e5a7c9d1f246
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.category_stats import install_category_stats, remove_category_stats
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a357'
+down_revision = 'e5a7c9d1f246'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'photo_category_stats',
+        sa.Column('storage_type', sa.String(length=20), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('photo_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('storage_type', 'category'),
+    )
+    # Counter triggers on photos, then a backfill from the existing rows
+    install_category_stats(op.get_bind())
+
+
+def downgrade() -> None:
+    remove_category_stats(op.get_bind())
+    op.drop_table('photo_category_stats')
@@ -1,11 +1,27 @@
 # app/api/v1/endpoints/local_photos.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import functools
+import mimetypes
 import os
 import logging
+import time
 
+from app.core.config import settings
+from app.core.cursors import decode_cursor, encode_cursor
+from app.core.http_cache import http_date, is_not_modified
+from app.core.http_range import file_range_response
+from app.core.image_variants import FORMAT_CONTENT_TYPES, get_local_variant, negotiate_format
+from app.core.photo_listing import listing_query, photo_row, photo_rows
+from app.core.placeholders import PlaceholderWorker
+from app.crud.crud_photo import count_capped, get_category_counts, search_photos
+from app.db.session import SessionLocal
 from app.dependencies.db import get_db
 from app.models.photo import Photo
 from app.models.album import Album
@@ -14,12 +30,56 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _write_placeholders(placeholders: Dict[str, str]) -> None:
+    db = SessionLocal()
+    try:
+        for photo_id, placeholder in placeholders.items():
+            db.query(Photo).filter(Photo.id == int(photo_id)).update(
+                {Photo.placeholder: placeholder}, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _store_placeholders(placeholders: Dict[str, str]) -> None:
+    await run_in_threadpool(_write_placeholders, placeholders)
+
+
+placeholder_worker = PlaceholderWorker(settings.PLACEHOLDER_CONCURRENCY, _store_placeholders)
+
+
+# Per-category counts shared by listing requests for CATEGORY_STATS_CACHE_SECONDS
+_category_counts: Dict = {"counts": None, "expires_at": 0.0}
+
+
+def _get_category_counts(db: Session) -> Dict[str, int]:
+    now = time.monotonic()
+    if _category_counts["counts"] is None or now >= _category_counts["expires_at"]:
+        _category_counts["counts"] = get_category_counts(db)
+        _category_counts["expires_at"] = now + settings.CATEGORY_STATS_CACHE_SECONDS
+    return _category_counts["counts"]
+
+
+async def _placeholder_source(category: str, filename: str) -> str:
+    return _resolve_local_path(category, filename)
+
+
+def _schedule_placeholders(photos: List[Row]) -> None:
+    """Queue placeholder rendering for listed photos that do not have one yet"""
+    placeholder_worker.schedule(
+        (str(photo.id), functools.partial(_placeholder_source, photo.category, photo.filename))
+        for photo in photos
+        if not photo.placeholder
+    )
+
+
 @router.get("/local/health")
 async def local_photos_health(db: Session = Depends(get_db)):
     """Health check for local photos service"""
     try:
         # Check database connection and photo count
-        photo_count = db.query(Photo).filter(Photo.storage_type == 'local').count()
+        photo_count = sum(get_category_counts(db).values())
         
         return {
             "status": "healthy",
@@ -33,56 +93,82 @@ async def local_photos_health(db: Session = Depends(get_db)):
         raise HTTPException(status_code=503, detail=f"Service unhealthy: {str(e)}")
 
 
-@router.get("/local/search")
+def _fetch_page(query, limit: int, cursor: Optional[str], score=None) -> Tuple[List[Row], Optional[str]]:
+    """One page of newest-first listing rows after `cursor`, plus the cursor for the next page.
+    
+    Keyset pagination on (created_at, id): the cursor holds the last row
+    sent and the next page starts strictly after it, so page 1000 is the
+    same index range scan as page 1 and rows inserted meanwhile do not
+    shift pages the way OFFSET would. With a relevance `score` the order
+    (and the cursor) becomes (score, created_at, id), best match first.
+    """
+    keys = [Photo.created_at, Photo.id] if score is None else [score, Photo.created_at, Photo.id]
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            last = [datetime.fromisoformat(position["t"]), int(position["i"])]
+            if score is not None:
+                last.insert(0, int(position["s"]))
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(*keys) < tuple_(*last))
+    
+    # Newest first, along ix_photos_storage_(category_)created_id (ranked
+    # searches sort their matches instead); one extra row tells whether
+    # another page exists
+    query = listing_query(query) if score is None else listing_query(query, score.label("score"))
+    rows = query.order_by(*(key.desc() for key in keys)).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_row = rows[-1]
+    position = {"t": last_row.created_at.isoformat(), "i": last_row.id}
+    if score is not None:
+        position["s"] = last_row.score
+    return rows, encode_cursor(position)
+
+
+@router.get("/local/search", response_class=ORJSONResponse)
 async def search_local_photos(
     q: str = Query(..., description="Search query"),
-    limit: Optional[int] = Query(50, description="Maximum number of results"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Search photos by title, description, filename, or category"""
+    """Search photos by title, description, filename, or category, best match first"""
     try:
-        query = db.query(Photo).filter(
-            Photo.storage_type == 'local'
-        ).filter(
-            (Photo.title.ilike(f"%{q}%")) |
-            (Photo.description.ilike(f"%{q}%")) |
-            (Photo.filename.ilike(f"%{q}%")) |
-            (Photo.category.ilike(f"%{q}%"))
-        )
-        
-        photos = query.limit(limit).all()
-        total_count = query.count()
+        query, score, backend = search_photos(db, q)
         
-        # Convert to API format
-        photo_data = []
-        for photo in photos:
-            photo_data.append({
-                "id": str(photo.id),
-                "category": photo.category,
-                "filename": photo.filename,
-                "description": photo.description or photo.title or photo.filename,
-                "baseUrl": f"/photos/{photo.category}/{photo.filename}",
-                "width": photo.width or 800,
-                "height": photo.height or 600,
-                "creationTime": photo.created_at.isoformat() if photo.created_at else None
-            })
+        rows, next_cursor = _fetch_page(query, limit, cursor, score)
+        if cursor is None and next_cursor is None:
+            # The whole result fits on this page
+            total_count, total_exact = len(rows), True
+        else:
+            total_count, total_exact = count_capped(query, settings.SEARCH_COUNT_CAP)
+        _schedule_placeholders(rows)
         
-        return {
-            "photos": photo_data,
+        return ORJSONResponse({
+            "photos": photo_rows(rows),
             "totalCount": total_count,
+            "totalCountExact": total_exact,
+            "nextCursor": next_cursor,
             "query": q,
+            "searchBackend": backend,
             "source": "local_database"
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching photos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error searching photos: {str(e)}")
 
 
-@router.get("/local")
+@router.get("/local", response_class=ORJSONResponse)
 async def get_local_photos(
     category: Optional[str] = Query(None, description="Filter by category"),
-    limit: Optional[int] = Query(200, description="Maximum number of photos"),
+    limit: int = Query(200, ge=1, le=500, description="Maximum number of photos"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     """Get photos from local database"""
@@ -92,66 +178,105 @@ async def get_local_photos(
         if category:
             query = query.filter(Photo.category == category)
             
-        photos = query.limit(limit).all()
-        total_count = query.count()
+        rows, next_cursor = _fetch_page(query, limit, cursor)
+        counts = _get_category_counts(db)
+        total_count = counts.get(category, 0) if category else sum(counts.values())
+        _schedule_placeholders(rows)
         
-        # Convert to API format
-        photo_data = []
-        for photo in photos:
-            photo_data.append({
-                "id": str(photo.id),
-                "category": photo.category,
-                "filename": photo.filename,
-                "description": photo.description or photo.title or photo.filename,
-                "baseUrl": f"/photos/{photo.category}/{photo.filename}",
-                "width": photo.width or 800,
-                "height": photo.height or 600,
-                "creationTime": photo.created_at.isoformat() if photo.created_at else None
-            })
-        
-        # Get unique categories
-        categories = db.query(Photo.category).filter(Photo.storage_type == 'local').distinct().all()
-        category_list = [cat[0] for cat in categories]
-        
-        return {
-            "photos": photo_data,
+        return ORJSONResponse({
+            "photos": photo_rows(rows),
             "totalCount": total_count,
-            "categories": category_list,
+            "nextCursor": next_cursor,
+            "categories": list(counts),
             "source": "local_database"
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching local photos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching photos: {str(e)}")
 
 
-@router.get("/local/{photo_id}")
+def _resolve_local_path(category: str, filename: str) -> str:
+    """Map /photos/{category}/{filename} to a file under LOCAL_PHOTOS_DIR"""
+    root = os.path.realpath(settings.LOCAL_PHOTOS_DIR)
+    path = os.path.realpath(os.path.join(root, category, filename))
+    # Reject anything that escapes the photos root (../, symlinks)
+    if not path.startswith(root + os.sep) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return path
+
+
+@router.get("/local/image/{category}/{filename}")
+async def get_local_photo_image(
+    request: Request,
+    category: str,
+    filename: str,
+    size: str = Query("medium", regex="^(small|medium|large|full|original)$")
+):
+    """Serve a local photo, resized server-side for every size but `original`"""
+    try:
+        path = _resolve_local_path(category, filename)
+        
+        if size == "original":
+            stat = os.stat(path)
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        else:
+            fmt = negotiate_format(request.headers.get("accept"))
+            cached, data = await get_local_variant(path, size, fmt)
+            if cached is None:
+                # Disk cache disabled: send the freshly rendered bytes
+                return Response(
+                    content=data,
+                    media_type=FORMAT_CONTENT_TYPES[fmt],
+                    headers={"Cache-Control": "public, max-age=86400", "Vary": "Accept"}
+                )
+            path, etag, media_type = cached.path, cached.etag, cached.content_type
+            stat = os.stat(path)
+        
+        headers = {
+            "Cache-Control": "public, max-age=86400",
+            "Vary": "Accept",
+            "ETag": etag,
+            "Last-Modified": http_date(stat.st_mtime),
+        }
+        if is_not_modified(request, etag, stat.st_mtime):
+            return Response(status_code=304, headers=headers)
+        
+        return file_range_response(
+            path,
+            stat.st_size,
+            media_type,
+            headers,
+            range_header=request.headers.get("range"),
+            if_range=request.headers.get("if-range")
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving local photo {category}/{filename}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error serving photo: {str(e)}")
+
+
+@router.get("/local/{photo_id}", response_class=ORJSONResponse)
 async def get_local_photo_by_id(
     photo_id: int,
     db: Session = Depends(get_db)
 ):
     """Get specific photo by ID"""
     try:
-        photo = db.query(Photo).filter(
+        row = listing_query(db.query(Photo).filter(
             Photo.id == photo_id,
             Photo.storage_type == 'local'
-        ).first()
+        )).first()
         
-        if not photo:
+        if not row:
             raise HTTPException(status_code=404, detail="Photo not found")
             
-        return {
-            "photo": {
-                "id": str(photo.id),
-                "category": photo.category,
-                "filename": photo.filename,
-                "description": photo.description or photo.title or photo.filename,
-                "baseUrl": f"/photos/{photo.category}/{photo.filename}",
-                "width": photo.width or 800,
-                "height": photo.height or 600,
-                "creationTime": photo.created_at.isoformat() if photo.created_at else None
-            }
-        }
+        return ORJSONResponse({"photo": photo_row(row)})
         
     except HTTPException:
         raise
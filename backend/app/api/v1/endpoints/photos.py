@@ -1,15 +1,35 @@
 # app/api/v1/endpoints/photos.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+import anyio
 import httpx
+import orjson
 import asyncio
+import functools
 import os
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
+from app.core.compression import EncodedJSON
+from app.core.config import settings
+from app.core.cursors import decode_cursor, encode_cursor
+from app.core.http_cache import http_date, is_not_modified
+from app.core.http_client import get_http_client, get_pool_stats
+from app.core.http_range import file_range_response
+from app.core.image_cache import CachedImage, ImageCacheWriter, image_cache, proxied_etag
+from app.core.image_variants import FORMAT_CONTENT_TYPES, format_variant, get_transcoded_variant, negotiate_format
+from app.core.sprites import get_sprite, sprite_cache_id, sprite_layout, sprite_version
+from app.core.placeholders import PlaceholderMap, PlaceholderSource, PlaceholderWorker
+from app.core.shared_cache import shared_photos_cache
+from app.core.thumbnail_prewarm import thumbnail_prewarmer
+from app.crud import crud_google_media
+from app.db.session import SessionLocal
+from starlette.concurrency import run_in_threadpool
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -27,26 +47,210 @@ ALBUM_IDS = {
     "wildlife": os.getenv("REACT_APP_WILDLIFE_ALBUM_ID"),
 }
 
-# In-memory cache for photos (in production, use Redis)
+def configured_categories() -> List[str]:
+    """Categories with an album ID set, in ALBUM_IDS order"""
+    return [category for category, album_id in ALBUM_IDS.items() if album_id]
+
+# mediaItems:search maximum page size
+MEDIA_ITEMS_PAGE_SIZE = 100
+
+# mediaItems:batchGet maximum ids per call
+BATCH_GET_MAX_IDS = 50
+
+# Distinct (category, fields) bodies kept pre-encoded per snapshot
+ENCODED_LISTINGS_PER_SNAPSHOT = 32
+
+class PhotosSnapshot:
+    """One album crawl plus the lookup indexes built from it.
+    
+    Indexes are built once when the cache is populated and never mutated
+    afterwards, so replacing the snapshot swaps list and indexes together.
+    """
+    
+    def __init__(
+        self,
+        photos: List[Dict],
+        fetched_at: Optional[datetime] = None,
+        base_url_fetched_at: Optional[Dict[str, float]] = None
+    ):
+        self.photos = photos
+        self.fetched_at = fetched_at or datetime.now()
+        # Strong validator for the album list, computed once per crawl
+        digest = hashlib.sha1(orjson.dumps(photos, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        self.etag = f'"{digest}"'
+        self.by_id: Dict[str, Dict] = {}
+        self.by_category: Dict[str, List[Dict]] = {}
+        # Position of each (category, id) in the full list (key None) and in
+        # its category list, so a cursor resolves to a slice start in O(1)
+        self.positions: Dict[Optional[str], Dict[Tuple[str, str], int]] = {None: {}}
+        for index, photo in enumerate(photos):
+            category = photo["category"]
+            key = (category, photo["id"])
+            self.by_id[photo["id"]] = photo
+            self.by_category.setdefault(category, []).append(photo)
+            self.positions[None][key] = index
+            self.positions.setdefault(category, {})[key] = len(self.by_category[category]) - 1
+        
+        # When each baseUrl was issued; items without an entry came with the crawl
+        crawled_at = self.fetched_at.timestamp()
+        base_url_fetched_at = base_url_fetched_at or {}
+        self.base_url_fetched_at: Dict[str, float] = {
+            photo_id: base_url_fetched_at.get(photo_id, crawled_at) for photo_id in self.by_id
+        }
+        # Refreshed baseUrls change the list, so they count as a modification
+        self.modified_at = max([crawled_at, *self.base_url_fetched_at.values()])
+        # Response bodies serialised for this generation, keyed by (category, fields)
+        self._encoded: Dict[Tuple, EncodedJSON] = {}
+        self._encoded_version: Optional[int] = None
+    
+    def get(self, photo_id: str) -> Optional[Dict]:
+        return self.by_id.get(photo_id)
+    
+    def listing(self, category: Optional[str] = None) -> List[Dict]:
+        """Photos in album order, optionally for one category"""
+        return self.photos if category is None else self.by_category.get(category, [])
+    
+    def position(self, category: Optional[str], photo: Tuple[str, str]) -> Optional[int]:
+        return self.positions.get(category, {}).get(photo)
+    
+    def encoded(
+        self,
+        category: Optional[str] = None,
+        projection: Optional[List[str]] = None,
+        placeholders: Optional[PlaceholderMap] = None
+    ) -> EncodedJSON:
+        """Full listing serialised once per snapshot (and placeholder version) and reused by every request"""
+        version = placeholders.version if placeholders is not None else None
+        if version != self._encoded_version:
+            self._encoded.clear()
+            self._encoded_version = version
+        key = (category, tuple(projection) if projection else None)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            if len(self._encoded) >= ENCODED_LISTINGS_PER_SNAPSHOT:
+                self._encoded.clear()
+            photos = _with_placeholders(self.listing(category), placeholders)
+            encoded = EncodedJSON(_project(photos, projection))
+            self._encoded[key] = encoded
+        return encoded
+    
+    def listing_etag(self, placeholders: Optional[PlaceholderMap] = None) -> str:
+        """Validator for the list as served, placeholders included"""
+        if not placeholders:
+            return self.etag
+        return f'"{self.etag.strip(chr(34))}-{placeholders.digest}"'
+    
+    def base_url_expired(self, photo_id: str) -> bool:
+        fetched_at = self.base_url_fetched_at.get(photo_id, 0.0)
+        return time.time() >= fetched_at + settings.GOOGLE_BASE_URL_TTL_SECONDS
+    
+    def _with_field(self, field: str, values: Dict[str, str]) -> List[Dict]:
+        return [
+            {**photo, field: values[photo["id"]]} if photo["id"] in values else photo
+            for photo in self.photos
+        ]
+    
+    def with_base_urls(self, base_urls: Dict[str, str], fetched_at: float) -> "PhotosSnapshot":
+        """Copy of this snapshot with some baseUrls replaced; the album crawl time is kept"""
+        base_url_fetched_at = dict(self.base_url_fetched_at)
+        for photo_id in base_urls:
+            if photo_id in base_url_fetched_at:
+                base_url_fetched_at[photo_id] = fetched_at
+        return PhotosSnapshot(self._with_field("baseUrl", base_urls), self.fetched_at, base_url_fetched_at)
+    
+    def age_seconds(self) -> int:
+        return int((datetime.now() - self.fetched_at).total_seconds())
+    
+    def is_fresh(self) -> bool:
+        return bool(self.photos) and datetime.now() < self.fetched_at + timedelta(seconds=settings.PHOTOS_CACHE_TTL_SECONDS)
+
+def _with_placeholders(photos: List[Dict], placeholders: Optional[PlaceholderMap]) -> List[Dict]:
+    if not placeholders:
+        return photos
+    values = placeholders.values
+    return [
+        {**photo, "placeholder": values[photo["id"]]} if photo["id"] in values else photo
+        for photo in photos
+    ]
+
+def _take_placeholders(photos: List[Dict]) -> Dict[str, str]:
+    """Move placeholders out of stored rows; listings merge them from album_placeholders"""
+    taken = {}
+    for photo in photos:
+        if photo.get("placeholder"):
+            taken[photo["id"]] = photo["placeholder"]
+            photo["placeholder"] = None
+    return taken
+
+# Rendered placeholders for the album list, merged into listings at encode
+# time so new ones never rebuild or republish the snapshot
+album_placeholders = PlaceholderMap()
+
+# In-process (L1) cache for photos; shared_photos_cache is the Redis L2
 photos_cache = {
-    "data": None,
+    "snapshot": None,
     "expires_at": None
 }
 
+# The single in-flight cache refresh, shared by every request that needs it
+_refresh_task: Optional[asyncio.Task] = None
+
+# How long a worker waits for another worker's crawl before crawling itself
+SHARED_REFRESH_WAIT_SECONDS = 30
+SHARED_REFRESH_POLL_SECONDS = 0.5
+
+# Lazy baseUrl refreshes requested within this window share one batchGet call
+BASE_URL_BATCH_WINDOW_SECONDS = 0.05
+_pending_base_urls: Dict[str, asyncio.Future] = {}
+_base_url_flush_task: Optional[asyncio.Task] = None
+
+# Rendered placeholders waiting for the next coalesced flush
+_pending_placeholders: Dict[str, str] = {}
+_placeholder_flush_task: Optional[asyncio.Task] = None
+
 class GooglePhotosService:
     def __init__(self):
         self.access_token = None
         self.token_expires_at = None
+        # Single in-flight token refresh and the proactive renewal loop
+        self._token_task: Optional[asyncio.Task] = None
+        self._renewal_task: Optional[asyncio.Task] = None
+        # Token refresh metrics
+        self.token_refresh_count = 0
+        self.token_refresh_failures = 0
+        self.token_refresh_last_ms: Optional[float] = None
+        self.token_refresh_total_ms = 0.0
+        # baseUrl refresh metrics
+        self.batch_get_calls = 0
+        self.base_urls_refreshed = 0
+        self.base_url_refresh_failures = 0
+    
+    def _token_is_valid(self) -> bool:
+        return bool(self.access_token and self.token_expires_at and datetime.now() < self.token_expires_at)
     
     async def get_access_token(self) -> str:
         """Get or refresh the access token"""
-        if self.access_token and self.token_expires_at and datetime.now() < self.token_expires_at:
+        if self._token_is_valid():
             return self.access_token
         
+        # Shielded so one cancelled caller does not abort the shared refresh
+        return await asyncio.shield(self.refresh_access_token())
+    
+    def refresh_access_token(self) -> asyncio.Task:
+        """Start a token refresh, or join the one already in flight"""
+        if self._token_task is None or self._token_task.done():
+            self._token_task = asyncio.create_task(self._refresh_access_token())
+            # Retrieve the exception so unawaited failures are not reported as unhandled
+            self._token_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._token_task
+    
+    async def _refresh_access_token(self) -> str:
         if not GOOGLE_REFRESH_TOKEN:
             raise HTTPException(status_code=500, detail="No refresh token configured")
         
-        async with httpx.AsyncClient() as client:
+        started = time.perf_counter()
+        try:
+            client = get_http_client()
             response = await client.post(
                 "https://oauth2.googleapis.com/token",
                 data={
@@ -62,128 +266,828 @@ class GooglePhotosService:
                 raise HTTPException(status_code=500, detail="Failed to refresh access token")
             
             token_data = response.json()
-            self.access_token = token_data["access_token"]
-            # Tokens typically expire in 1 hour
-            self.token_expires_at = datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600) - 60)
-            
-            return self.access_token
+        except Exception:
+            self.token_refresh_failures += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.token_refresh_last_ms = elapsed_ms
+            self.token_refresh_total_ms += elapsed_ms
+            self.token_refresh_count += 1
+        
+        self.access_token = token_data["access_token"]
+        # Tokens typically expire in 1 hour
+        self.token_expires_at = datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600) - 60)
+        
+        return self.access_token
+    
+    async def _renew_token_loop(self):
+        """Refresh the token ahead of expiry so request paths never wait on OAuth"""
+        while True:
+            try:
+                if self.token_expires_at:
+                    delay = (self.token_expires_at - datetime.now()).total_seconds() - settings.GOOGLE_TOKEN_RENEWAL_LEAD_SECONDS
+                    # Tokens shorter-lived than the lead time would otherwise be
+                    # renewed back to back
+                    await asyncio.sleep(max(delay, settings.GOOGLE_TOKEN_RENEWAL_RETRY_SECONDS))
+                await self.refresh_access_token()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Proactive token renewal failed: {e}")
+                await asyncio.sleep(settings.GOOGLE_TOKEN_RENEWAL_RETRY_SECONDS)
     
-    async def get_album_photos(self, album_id: str) -> List[Dict]:
-        """Get photos from a specific album"""
+    def start_token_renewal(self):
+        """Start the background renewal loop (called from the app lifespan)"""
+        if not GOOGLE_REFRESH_TOKEN:
+            logger.info("No Google refresh token configured - proactive token renewal disabled")
+            return
+        if self._renewal_task is None or self._renewal_task.done():
+            self._renewal_task = asyncio.create_task(self._renew_token_loop())
+    
+    async def stop_token_renewal(self):
+        if self._renewal_task is not None:
+            self._renewal_task.cancel()
+            try:
+                await self._renewal_task
+            except asyncio.CancelledError:
+                pass
+            self._renewal_task = None
+    
+    def token_refresh_stats(self) -> Dict:
+        return {
+            "refreshCount": self.token_refresh_count,
+            "failureCount": self.token_refresh_failures,
+            "lastLatencyMs": round(self.token_refresh_last_ms, 1) if self.token_refresh_last_ms is not None else None,
+            "avgLatencyMs": round(self.token_refresh_total_ms / self.token_refresh_count, 1) if self.token_refresh_count else None,
+            "renewalActive": bool(self._renewal_task and not self._renewal_task.done()),
+        }
+    
+    async def iter_album_photos(self, album_id: str) -> AsyncIterator[Dict]:
+        """Stream every media item in an album, following nextPageToken page by page"""
         if not album_id:
-            return []
+            return
         
-        access_token = await self.get_access_token()
+        client = get_http_client()
+        page_token = None
         
-        async with httpx.AsyncClient() as client:
+        while True:
+            access_token = await self.get_access_token()
+            body = {
+                "albumId": album_id,
+                "pageSize": MEDIA_ITEMS_PAGE_SIZE
+            }
+            if page_token:
+                body["pageToken"] = page_token
+            
             response = await client.post(
                 "https://photoslibrary.googleapis.com/v1/mediaItems:search",
                 headers={"Authorization": f"Bearer {access_token}"},
-                json={
-                    "albumId": album_id,
-                    "pageSize": 100
-                }
+                json=body
             )
             
             if response.status_code != 200:
                 logger.error(f"Failed to get album {album_id}: {response.text}")
-                return []
+                raise HTTPException(status_code=502, detail=f"Failed to get album {album_id}")
             
             data = response.json()
-            return data.get("mediaItems", [])
+            for item in data.get("mediaItems", []):
+                yield item
+            
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return
+    
+    async def get_category_photos(self, category: str, album_id: str) -> Optional[List[Dict]]:
+        """Get photos for one category; None if the album could not be read completely"""
+        photos = []
+        try:
+            async for photo in self.iter_album_photos(album_id):
+                photos.append({
+                    "id": photo["id"],
+                    "baseUrl": photo["baseUrl"],
+                    "filename": photo["filename"],
+                    "description": photo.get("description", ""),
+                    "category": category,
+                    "mediaMetadata": photo.get("mediaMetadata", {}),
+                    "creationTime": photo.get("mediaMetadata", {}).get("creationTime")
+                })
+        except Exception as e:
+            logger.error(f"Error getting photos for category {category}: {e}")
+            return None
+        
+        return photos
+    
+    async def crawl_categories(self) -> Dict[str, Optional[List[Dict]]]:
+        """Crawl every configured album concurrently, keyed by category in ALBUM_IDS order.
+        
+        A failed category maps to None so callers can tell "empty" from "unknown".
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.GOOGLE_PHOTOS_ALBUM_CONCURRENCY))
+        
+        async def fetch(category: str, album_id: str) -> Optional[List[Dict]]:
+            async with semaphore:
+                return await self.get_category_photos(category, album_id)
+        
+        categories = [(category, ALBUM_IDS[category]) for category in configured_categories()]
+        # gather preserves ALBUM_IDS order
+        results = await asyncio.gather(*(fetch(category, album_id) for category, album_id in categories))
+        return {category: photos for (category, _), photos in zip(categories, results)}
     
     async def get_all_categorized_photos(self) -> List[Dict]:
         """Get photos from all configured albums with categories"""
-        all_photos = []
-        
-        # Get photos from each category
-        for category, album_id in ALBUM_IDS.items():
-            if album_id:
-                try:
-                    photos = await self.get_album_photos(album_id)
-                    for photo in photos:
-                        all_photos.append({
-                            "id": photo["id"],
-                            "baseUrl": photo["baseUrl"],
-                            "filename": photo["filename"],
-                            "description": photo.get("description", ""),
-                            "category": category,
-                            "mediaMetadata": photo.get("mediaMetadata", {}),
-                            "creationTime": photo.get("mediaMetadata", {}).get("creationTime")
-                        })
-                except Exception as e:
-                    logger.error(f"Error getting photos for category {category}: {e}")
-        
-        return all_photos
+        crawl = await self.crawl_categories()
+        return [photo for photos in crawl.values() if photos for photo in photos]
+    
+    async def _batch_get(self, media_item_ids: List[str]) -> Dict[str, Dict]:
+        client = get_http_client()
+        access_token = await self.get_access_token()
+        self.batch_get_calls += 1
+        response = await client.get(
+            "https://photoslibrary.googleapis.com/v1/mediaItems:batchGet",
+            headers={"Authorization": f"Bearer {access_token}"},
+            params=[("mediaItemIds", media_item_id) for media_item_id in media_item_ids]
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"mediaItems:batchGet failed: {response.text}")
+            raise HTTPException(status_code=502, detail="Failed to refresh media items")
+        
+        items = {}
+        for result in response.json().get("mediaItemResults", []):
+            item = result.get("mediaItem")
+            if item and item.get("baseUrl"):
+                items[item["id"]] = item
+            else:
+                # Deleted or no longer shared with us
+                self.base_url_refresh_failures += 1
+                logger.warning(f"batchGet could not return {result.get('mediaItemId')}: {result.get('status')}")
+        return items
+    
+    async def batch_get_media_items(self, media_item_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch current media items (and fresh baseUrls) by id, 50 ids per call"""
+        semaphore = asyncio.Semaphore(max(1, settings.GOOGLE_PHOTOS_ALBUM_CONCURRENCY))
+        
+        async def fetch(chunk: List[str]) -> Dict[str, Dict]:
+            async with semaphore:
+                return await self._batch_get(chunk)
+        
+        chunks = [media_item_ids[i:i + BATCH_GET_MAX_IDS] for i in range(0, len(media_item_ids), BATCH_GET_MAX_IDS)]
+        items = {}
+        for result in await asyncio.gather(*(fetch(chunk) for chunk in chunks)):
+            items.update(result)
+        self.base_urls_refreshed += len(items)
+        return items
+    
+    def base_url_refresh_stats(self) -> Dict:
+        return {
+            "batchGetCalls": self.batch_get_calls,
+            "refreshed": self.base_urls_refreshed,
+            "failures": self.base_url_refresh_failures,
+        }
 
 # Initialize the service
 google_photos_service = GooglePhotosService()
 
-@router.get("/albums")
-async def get_photo_albums():
-    """Get all categorized photos from Google Photos albums"""
+def _install_snapshot(snapshot: PhotosSnapshot) -> None:
+    photos_cache["snapshot"] = snapshot
+    photos_cache["expires_at"] = snapshot.fetched_at + timedelta(seconds=settings.PHOTOS_CACHE_TTL_SECONDS)
+    album_placeholders.retain(snapshot.by_id)
+
+async def _load_shared_snapshot() -> Optional[PhotosSnapshot]:
+    """Pull the album list from the shared cache into L1 if it is newer"""
+    shared = await shared_photos_cache.load()
+    if not shared:
+        return None
+    
+    photos, fetched_at, base_url_fetched_at = shared
+    current = photos_cache["snapshot"]
+    if current and current.modified_at >= max([fetched_at, *base_url_fetched_at.values()]):
+        return current
+    
+    snapshot = PhotosSnapshot(photos, datetime.fromtimestamp(fetched_at), base_url_fetched_at)
+    _install_snapshot(snapshot)
+    if not current or current.fetched_at != snapshot.fetched_at or not album_placeholders:
+        # A new crawl may list photos whose placeholders this worker never saw
+        album_placeholders.update(await shared_photos_cache.load_placeholders(), snapshot.modified_at)
+    return snapshot
+
+async def _wait_for_shared_snapshot() -> Optional[PhotosSnapshot]:
+    """Wait for the worker holding the refresh lock to publish its crawl"""
+    deadline = time.monotonic() + SHARED_REFRESH_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(SHARED_REFRESH_POLL_SECONDS)
+        snapshot = await _load_shared_snapshot()
+        if snapshot and snapshot.is_fresh():
+            return snapshot
+    return None
+
+def _sync_and_read_media_items(crawl: Dict[str, Optional[List[Dict]]]) -> Tuple[List[Dict], Dict[str, float]]:
+    """Apply a crawl to the media item table and read the full list back"""
+    db = SessionLocal()
+    try:
+        stats = crud_google_media.sync_media_items(db, crawl)
+        logger.info(f"Media item sync: {stats}")
+        return crud_google_media.get_media_items(db, configured_categories()), crud_google_media.get_base_url_fetched_at(db)
+    finally:
+        db.close()
+
+def _read_stored_media_items():
+    db = SessionLocal()
+    try:
+        return (
+            crud_google_media.get_media_items(db, configured_categories()),
+            crud_google_media.get_last_synced_at(db),
+            crud_google_media.get_base_url_fetched_at(db),
+        )
+    finally:
+        db.close()
+
+def _store_base_urls(base_urls: Dict[str, str], fetched_at: float) -> None:
+    db = SessionLocal()
+    try:
+        crud_google_media.update_base_urls(db, base_urls, datetime.fromtimestamp(fetched_at, timezone.utc))
+    finally:
+        db.close()
+
+async def _crawl_and_sync() -> Tuple[List[Dict], Dict[str, float]]:
+    """Crawl Google, persist the delta and return the album list as stored.
+    
+    Categories that fail to crawl keep their stored rows, so a Google outage
+    serves the last good data. Without a database the crawl is used directly.
+    """
+    crawl = await google_photos_service.crawl_categories()
+    try:
+        return await run_in_threadpool(_sync_and_read_media_items, crawl)
+    except Exception as e:
+        logger.warning(f"Media item table unavailable, serving the crawl directly: {e}")
+        return [photo for photos in crawl.values() if photos for photo in photos], {}
+
+async def load_photos_cache_from_db() -> None:
+    """Warm L1 from the media item table so a restart does not start with a crawl"""
+    if photos_cache["snapshot"]:
+        return
+    try:
+        photos, synced_at, base_url_fetched_at = await run_in_threadpool(_read_stored_media_items)
+    except Exception as e:
+        logger.warning(f"Could not load stored media items: {e}")
+        return
+    if not photos or not synced_at:
+        return
+    if synced_at.tzinfo:
+        synced_at = synced_at.astimezone().replace(tzinfo=None)
+    album_placeholders.update(_take_placeholders(photos))
+    snapshot = PhotosSnapshot(photos, synced_at, base_url_fetched_at)
+    _install_snapshot(snapshot)
+    _schedule_placeholders(snapshot)
+    logger.info(f"Loaded {len(photos)} stored media items (synced {synced_at.isoformat()})")
+
+async def _refresh_photos_cache() -> PhotosSnapshot:
+    """Re-crawl the albums and swap in a new snapshot"""
+    # Another worker may already have refreshed the shared copy
+    snapshot = await _load_shared_snapshot()
+    if snapshot and snapshot.is_fresh():
+        return snapshot
+    
+    lock = shared_photos_cache.refresh_lock()
+    if lock and not await shared_photos_cache.try_acquire(lock):
+        snapshot = await _wait_for_shared_snapshot()
+        if snapshot:
+            return snapshot
+        logger.warning("Timed out waiting for another worker's photos refresh, crawling locally")
+        lock = None
+    
+    try:
+        photos, base_url_fetched_at = await _crawl_and_sync()
+        
+        previous = photos_cache["snapshot"]
+        # Without the media item table the crawl has no placeholders; the known ones stay in album_placeholders
+        stored = _take_placeholders(photos)
+        new_placeholders = {photo_id: value for photo_id, value in stored.items() if album_placeholders.values.get(photo_id) != value}
+        snapshot = PhotosSnapshot(photos, base_url_fetched_at=base_url_fetched_at)
+        _install_snapshot(snapshot)
+        album_placeholders.update(new_placeholders)
+        _prewarm_new_photos(previous, snapshot)
+        _schedule_placeholders(snapshot)
+        # Placeholders first, so workers loading the new snapshot also find them
+        await shared_photos_cache.store_placeholders(new_placeholders, album_placeholders.modified_at)
+        await _publish_snapshot(snapshot)
+    finally:
+        if lock:
+            await shared_photos_cache.release(lock)
+    
+    logger.info(f"Retrieved {len(photos)} photos from Google Photos")
+    return snapshot
+
+async def _publish_snapshot(snapshot: PhotosSnapshot) -> None:
+    await shared_photos_cache.store(
+        snapshot.photos,
+        snapshot.fetched_at.timestamp(),
+        snapshot.etag,
+        snapshot.base_url_fetched_at
+    )
+
+def _prewarm_new_photos(previous: Optional[PhotosSnapshot], snapshot: PhotosSnapshot) -> None:
+    """Queue grid-size thumbnails for media items the previous crawl did not have"""
+    if not settings.PREWARM_ENABLED:
+        return
+    known = previous.by_id if previous else {}
+    thumbnail_prewarmer.schedule(
+        (photo["id"], size, f"{photo['baseUrl']}{GOOGLE_SIZE_PARAMS[size]}")
+        for photo in snapshot.photos
+        if photo["id"] not in known
+        for size in settings.PREWARM_SIZES
+    )
+
+async def _thumbnail_source(photo: Dict) -> PlaceholderSource:
+    """Small thumbnail for placeholder rendering, from the image cache or Google"""
+    cached = image_cache.peek(photo["id"], "small")
+    if cached:
+        return cached.path
+    response = await _open_upstream_image(photo, "small")
+    try:
+        if response.status_code != 200:
+            raise ValueError(f"upstream returned {response.status_code}")
+        content = await response.aread()
+    finally:
+        await response.aclose()
+    # The grid asks for this thumbnail next, so keep it
+    await image_cache.put(
+        photo["id"],
+        "small",
+        response.headers.get("content-type", "image/jpeg"),
+        content,
+        proxied_etag(photo["id"], "small", response.headers.get("etag"))
+    )
+    return content
+
+def _store_placeholders_in_db(placeholders: Dict[str, str]) -> None:
+    db = SessionLocal()
+    try:
+        crud_google_media.update_placeholders(db, placeholders)
+    finally:
+        db.close()
+
+async def _flush_placeholders() -> None:
+    """Merge pending placeholders into the listing and share them with the other workers"""
+    global _placeholder_flush_task
+    _placeholder_flush_task = None
+    pending = dict(_pending_placeholders)
+    _pending_placeholders.clear()
+    if not pending:
+        return
+    modified_at = time.time()
+    album_placeholders.update(pending, modified_at)
+    await shared_photos_cache.store_placeholders(pending, modified_at)
+
+async def _flush_placeholders_later() -> None:
+    await asyncio.sleep(settings.PLACEHOLDER_PUBLISH_INTERVAL_SECONDS)
+    await _flush_placeholders()
+
+async def stop_placeholder_publishing() -> None:
+    """Apply and share whatever is still pending (called from the app lifespan)"""
+    if _placeholder_flush_task is not None:
+        _placeholder_flush_task.cancel()
+    await _flush_placeholders()
+
+async def _store_placeholders(placeholders: Dict[str, str]) -> None:
+    """Persist a batch of rendered placeholders and queue it for the listing"""
+    global _placeholder_flush_task
+    snapshot = photos_cache["snapshot"]
+    if not snapshot:
+        return
+    placeholders = {photo_id: value for photo_id, value in placeholders.items() if photo_id in snapshot.by_id}
+    if not placeholders:
+        return
+    # Batches arriving within the interval become one listing change and one publish
+    _pending_placeholders.update(placeholders)
+    if _placeholder_flush_task is None:
+        _placeholder_flush_task = asyncio.create_task(_flush_placeholders_later())
+    try:
+        await run_in_threadpool(_store_placeholders_in_db, placeholders)
+    except Exception as e:
+        logger.warning(f"Could not store placeholders: {e}")
+
+placeholder_worker = PlaceholderWorker(settings.PLACEHOLDER_CONCURRENCY, _store_placeholders)
+
+def _schedule_placeholders(snapshot: PhotosSnapshot) -> None:
+    """Queue placeholder rendering for photos that do not have one yet"""
+    placeholder_worker.schedule(
+        (photo["id"], functools.partial(_thumbnail_source, photo))
+        for photo in snapshot.by_id.values()
+        if photo["id"] not in album_placeholders and photo["id"] not in _pending_placeholders
+    )
+
+async def _on_shared_cache_event(message: Dict) -> None:
+    """Apply another worker's refresh or clear to this worker's L1"""
+    if message.get("op") == "clear":
+        photos_cache["snapshot"] = None
+        photos_cache["expires_at"] = None
+        album_placeholders.clear()
+    elif message.get("op") == "placeholders":
+        placeholders = await shared_photos_cache.load_placeholders(message.get("ids") or [])
+        album_placeholders.update(placeholders, message.get("modified_at"))
+    elif message.get("op") == "update":
+        current = photos_cache["snapshot"]
+        if not current or current.etag != message.get("etag"):
+            await _load_shared_snapshot()
+
+def start_photos_cache_sync() -> None:
+    """Subscribe to cross-worker cache events (called from the app lifespan)"""
+    shared_photos_cache.start_listener(_on_shared_cache_event)
+
+async def stop_photos_cache_sync() -> None:
+    await shared_photos_cache.stop_listener()
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background photos cache refresh failed: {task.exception()}")
+
+def refresh_photos_cache() -> asyncio.Task:
+    """Start a cache refresh, or join the one already in flight"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_photos_cache())
+        _refresh_task.add_done_callback(_log_refresh_failure)
+    return _refresh_task
+
+async def _refresh_base_urls(photo_ids: List[str]) -> Optional[PhotosSnapshot]:
+    """Re-fetch baseUrls through batchGet and swap in a snapshot carrying them"""
+    items = await google_photos_service.batch_get_media_items(photo_ids)
+    # Applied to whatever snapshot is current now, which may be a newer crawl
+    snapshot = photos_cache["snapshot"]
+    if not items or not snapshot:
+        return snapshot
+    
+    fetched_at = time.time()
+    base_urls = {photo_id: item["baseUrl"] for photo_id, item in items.items() if photo_id in snapshot.by_id}
+    snapshot = snapshot.with_base_urls(base_urls, fetched_at)
+    _install_snapshot(snapshot)
+    logger.info(f"Refreshed {len(base_urls)} baseUrls")
+    
+    await _publish_snapshot(snapshot)
+    try:
+        await run_in_threadpool(_store_base_urls, base_urls, fetched_at)
+    except Exception as e:
+        logger.warning(f"Could not store refreshed baseUrls: {e}")
+    return snapshot
+
+async def _flush_base_url_refreshes() -> None:
+    pending: Dict[str, asyncio.Future] = {}
     try:
-        # Check cache first
-        if (photos_cache["data"] and 
-            photos_cache["expires_at"] and 
-            datetime.now() < photos_cache["expires_at"]):
-            return photos_cache["data"]
+        while _pending_base_urls:
+            # Let the rest of a page's image requests join the batch
+            await asyncio.sleep(BASE_URL_BATCH_WINDOW_SECONDS)
+            pending = dict(_pending_base_urls)
+            _pending_base_urls.clear()
+            try:
+                snapshot = await _refresh_base_urls(list(pending))
+            except Exception as e:
+                logger.warning(f"Lazy baseUrl refresh failed: {e}")
+                snapshot = None
+            for photo_id, future in pending.items():
+                if not future.done():
+                    future.set_result(snapshot.get(photo_id) if snapshot else None)
+    finally:
+        # Only this task resolves the futures: never leave a caller waiting on
+        # one when it is cancelled or fails unexpectedly
+        waiting = list(pending.values()) + list(_pending_base_urls.values())
+        _pending_base_urls.clear()
+        for future in waiting:
+            if not future.done():
+                future.set_exception(RuntimeError("baseUrl refresh was interrupted"))
+
+async def refresh_base_url(photo_id: str) -> Optional[Dict]:
+    """Get the photo with a fresh baseUrl; concurrent requests are batched into one batchGet"""
+    global _base_url_flush_task
+    future = _pending_base_urls.get(photo_id)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        _pending_base_urls[photo_id] = future
+        if _base_url_flush_task is None or _base_url_flush_task.done():
+            _base_url_flush_task = asyncio.create_task(_flush_base_url_refreshes())
+    # Shielded so a disconnecting client does not cancel the batch for others
+    return await asyncio.shield(future)
+
+async def _current_snapshot() -> Tuple[PhotosSnapshot, str]:
+    """The album snapshot to serve, with its cache status (HIT, STALE or MISS)"""
+    snapshot = photos_cache["snapshot"]
+    expires_at = photos_cache["expires_at"]
+    now = datetime.now()
+    
+    if snapshot and snapshot.photos and expires_at:
+        if now < expires_at:
+            return snapshot, "HIT"
+        # Stale but within bound: serve it and revalidate in the background
+        if now < expires_at + timedelta(seconds=settings.PHOTOS_CACHE_MAX_STALE_SECONDS):
+            refresh_photos_cache()
+            return snapshot, "STALE"
+    
+    # Missing or too stale: wait for the shared refresh. Shielded so a
+    # disconnecting client does not cancel it for everyone else.
+    return await asyncio.shield(refresh_photos_cache()), "MISS"
+
+# Fields a client may ask /albums to return (id is always included)
+ALBUM_PHOTO_FIELDS = ("id", "baseUrl", "filename", "description", "category", "mediaMetadata", "creationTime", "placeholder")
+
+# Largest page /albums hands out in one response
+ALBUMS_MAX_PAGE_SIZE = 500
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in ALBUM_PHOTO_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id", *[field for field in ALBUM_PHOTO_FIELDS if field in requested and field != "id"]]
+
+def _project(photos: List[Dict], projection: Optional[List[str]]) -> List[Dict]:
+    if not projection:
+        return photos
+    return [{field: photo.get(field) for field in projection} for photo in photos]
+
+def _page_start(snapshot: PhotosSnapshot, category: Optional[str], cursor: Optional[str]) -> int:
+    """Resolve a cursor to the index the next page starts at"""
+    if not cursor:
+        return 0
+    try:
+        position = decode_cursor(cursor)
+        if position.get("c") != category:
+            raise ValueError("Cursor belongs to another listing")
+        last = (position["lc"], position["li"])
+        offset = int(position["o"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Resume after the last photo sent; if a re-crawl removed it, fall back to the offset
+    index = snapshot.position(category, last)
+    return index + 1 if index is not None else offset
+
+@router.get("/albums", response_class=ORJSONResponse)
+async def get_photo_albums(
+    request: Request,
+    category: Optional[str] = Query(None, description="Only photos from this category"),
+    limit: Optional[int] = Query(None, ge=1, le=ALBUMS_MAX_PAGE_SIZE, description="Page size; enables pagination"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated photo fields to return")
+):
+    """Get categorized photos from Google Photos albums.
+    
+    Without limit/cursor the whole (optionally filtered) list is returned;
+    with them the response is a page plus the cursor for the next one.
+    """
+    try:
+        if category is not None and category not in ALBUM_IDS:
+            raise HTTPException(status_code=400, detail=f"Unknown category: {category}")
+        projection = _parse_fields(fields)
         
-        # Fetch fresh data
-        photos = await google_photos_service.get_all_categorized_photos()
+        snapshot, cache_status = await _current_snapshot()
         
-        # Cache for 30 minutes
-        photos_cache["data"] = photos
-        photos_cache["expires_at"] = datetime.now() + timedelta(minutes=30)
+        paginated = limit is not None or cursor is not None
+        start = _page_start(snapshot, category, cursor) if paginated else 0
+        etag = snapshot.listing_etag(album_placeholders)
+        if category or projection or paginated:
+            # One representation per snapshot and query
+            variant = f"{etag}|{category}|{limit}|{start}|{projection}"
+            etag = f'"{hashlib.sha1(variant.encode()).hexdigest()}"'
+        modified_at = max(snapshot.modified_at, album_placeholders.modified_at)
         
-        logger.info(f"Retrieved {len(photos)} photos from Google Photos")
-        return photos
+        headers = {
+            "X-Cache": cache_status,
+            "Age": str(snapshot.age_seconds()),
+            "ETag": etag,
+            "Last-Modified": http_date(modified_at),
+        }
+        if is_not_modified(request, etag, modified_at):
+            return Response(status_code=304, headers=headers)
+        
+        if not paginated:
+            # Unchanged album JSON is serialised (and compressed) once per snapshot
+            return await snapshot.encoded(category, projection, album_placeholders).response(request, headers)
+        
+        photos = snapshot.listing(category)
+        end = start + (limit or ALBUMS_MAX_PAGE_SIZE)
+        page = _project(_with_placeholders(photos[start:end], album_placeholders), projection)
+        next_cursor = None
+        if end < len(photos):
+            last = photos[end - 1]
+            next_cursor = encode_cursor({"c": category, "lc": last["category"], "li": last["id"], "o": end})
+        return ORJSONResponse({
+            "photos": page,
+            "totalCount": len(photos),
+            "nextCursor": next_cursor
+        }, headers=headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching photo albums: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch photos: {str(e)}")
 
+# Google Photos URL suffix per size variant
+GOOGLE_SIZE_PARAMS = {
+    "small": "=w400-h400",
+    "medium": "=w800-h800", 
+    "large": "=w1200-h1200",
+    "full": "=w2048-h2048"
+}
+
+# Upstream headers forwarded as-is by the image proxy; the ETag is replaced
+# by our own validator (see proxied_etag)
+PROXIED_IMAGE_HEADERS = ("content-length", "content-encoding", "content-range", "last-modified")
+
+async def _stream_upstream(response: httpx.Response, writer: Optional[ImageCacheWriter] = None) -> AsyncIterator[bytes]:
+    """Relay an upstream body chunk by chunk, undecoded so Content-Length stays valid.
+    
+    Starlette cancels this generator when the client disconnects; the
+    finally block then closes the upstream response so Google stops sending.
+    When a cache writer is given the body is teed into it and only
+    committed once the whole body has been relayed.
+    
+    The cleanup runs shielded: inside Starlette's cancelled scope every
+    unshielded await is cancelled again, which would leak the temp file.
+    """
+    completed = False
+    try:
+        async for chunk in response.aiter_raw(settings.IMAGE_STREAM_CHUNK_SIZE):
+            if writer:
+                await writer.write(chunk)
+            yield chunk
+        completed = True
+    finally:
+        with anyio.CancelScope(shield=True):
+            await response.aclose()
+            if writer:
+                if completed:
+                    try:
+                        await writer.commit()
+                    except Exception as e:
+                        logger.warning(f"Failed to cache image variant: {e}")
+                        await writer.abort()
+                else:
+                    await writer.abort()
+
+def _serve_cached_image(request: Request, cached: CachedImage, cache_status: str) -> Response:
+    """Send a disk-cached variant with validators and Range support"""
+    headers = {
+        "Cache-Control": "public, max-age=86400",
+        "Vary": "Accept",
+        "X-Cache": cache_status,
+        "ETag": cached.etag,
+        "Last-Modified": http_date(cached.stored_at),
+    }
+    if is_not_modified(request, cached.etag, cached.stored_at):
+        return Response(status_code=304, headers=headers)
+    return file_range_response(
+        cached.path,
+        cached.size,
+        cached.content_type,
+        headers,
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range")
+    )
+
+async def _open_upstream_image(photo: Dict, size: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """Start a streamed upstream fetch, renewing the baseUrl when it has expired.
+    
+    Google answers an expired or revoked baseUrl with 403; the URL is then
+    refreshed through batchGet and the request retried once.
+    """
+    photo_id = photo["id"]
+    snapshot = photos_cache["snapshot"]
+    if snapshot and snapshot.base_url_expired(photo_id):
+        photo = await refresh_base_url(photo_id) or photo
+    
+    client = get_http_client()
+    request = client.build_request("GET", f"{photo['baseUrl']}{GOOGLE_SIZE_PARAMS[size]}", headers=headers)
+    response = await client.send(request, stream=True)
+    if response.status_code != 403:
+        return response
+    
+    await response.aclose()
+    logger.info(f"Upstream rejected the baseUrl for {photo_id}, refreshing it")
+    refreshed = await refresh_base_url(photo_id)
+    if not refreshed:
+        raise HTTPException(status_code=404, detail="Image not found")
+    request = client.build_request("GET", f"{refreshed['baseUrl']}{GOOGLE_SIZE_PARAMS[size]}", headers=headers)
+    return await client.send(request, stream=True)
+
+async def _download_to_cache(photo: Dict, size: str) -> Optional[CachedImage]:
+    """Stream a whole upstream variant into the disk cache (needed before transcoding).
+    
+    The body goes chunk by chunk into a cache writer rather than memory;
+    returns None when the cache is unavailable or rejects the entry.
+    """
+    response = await _open_upstream_image(photo, size)
+    writer = None
+    committed = False
+    try:
+        if response.status_code != 200:
+            raise HTTPException(status_code=404, detail="Image not found")
+        writer = await image_cache.open_writer(
+            photo["id"],
+            size,
+            response.headers.get("content-type", "image/jpeg"),
+            proxied_etag(photo["id"], size, response.headers.get("etag"))
+        )
+        if writer is None:
+            return None
+        # Decoded, unlike the pass-through: the cache stores the image itself
+        async for chunk in response.aiter_bytes(settings.IMAGE_STREAM_CHUNK_SIZE):
+            await writer.write(chunk)
+        await writer.commit()
+        committed = True
+    except OSError as e:
+        logger.warning(f"Failed to cache image variant: {e}")
+        return None
+    finally:
+        with anyio.CancelScope(shield=True):
+            await response.aclose()
+            if writer and not committed:
+                await writer.abort()
+    return image_cache.entries.get(writer.key)
+
 @router.get("/image/{photo_id}")
 async def get_photo_image(
+    request: Request,
     photo_id: str,
     size: str = Query("medium", regex="^(small|medium|large|full)$")
 ):
     """Proxy and resize photos from Google Photos"""
     try:
-        # Get the photo's base URL (this would need to be cached or fetched)
-        photos = photos_cache.get("data", [])
-        photo = next((p for p in photos if p["id"] == photo_id), None)
+        # WebP/AVIF when the client explicitly accepts them
+        fmt = negotiate_format(request.headers.get("accept"))
+        
+        # Only photos still in a configured album are served, even when
+        # their variants linger in the disk cache
+        snapshot = photos_cache["snapshot"]
+        photo = snapshot.get(photo_id) if snapshot else None
         
         if not photo:
             raise HTTPException(status_code=404, detail="Photo not found")
         
-        base_url = photo["baseUrl"]
+        # Serve from the local disk cache when we already have this variant
+        cached = await image_cache.get(photo_id, format_variant(size, fmt))
+        if cached:
+            return _serve_cached_image(request, cached, "HIT")
+        
+        if fmt != "jpeg" and image_cache.loaded:
+            # Transcode from the cached JPEG; the transcoded copy is stored alongside it
+            source = image_cache.peek(photo_id, size) or await _download_to_cache(photo, size)
+            if source:
+                transcoded, _ = await get_transcoded_variant(photo_id, size, source, fmt)
+                if transcoded:
+                    return _serve_cached_image(request, transcoded, "MISS")
+            # Entry rejected (e.g. over the byte budget): pass the original through
+        
+        # Stream the image straight through without buffering the body;
+        # byte ranges are passed to Google as-is. If-Range carries our own
+        # validator, which Google cannot evaluate, so a conditional range
+        # gets the whole body instead of a possibly mismatched part.
+        upstream_headers = {}
+        range_header = request.headers.get("range")
+        if range_header and "if-range" not in request.headers:
+            upstream_headers["Range"] = range_header
+        
+        response = await _open_upstream_image(photo, size, upstream_headers)
+        
+        if response.status_code == 416:
+            await response.aclose()
+            return Response(status_code=416, headers={"Content-Range": response.headers.get("content-range", "bytes */*")})
+        
+        if response.status_code not in (200, 206):
+            await response.aclose()
+            raise HTTPException(status_code=404, detail="Image not found")
         
-        # Add size parameters to Google Photos URL
-        size_params = {
-            "small": "=w400-h400",
-            "medium": "=w800-h800", 
-            "large": "=w1200-h1200",
-            "full": "=w2048-h2048"
+        headers = {
+            "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+            "Accept-Ranges": "bytes",
+            "Vary": "Accept",
+            "X-Cache": "MISS"
         }
+        etag = proxied_etag(photo_id, size, response.headers.get("etag"))
+        if etag:
+            headers["ETag"] = etag
+            if is_not_modified(request, etag, None):
+                await response.aclose()
+                return Response(status_code=304, headers=headers)
         
-        image_url = f"{base_url}{size_params.get(size, size_params['medium'])}"
+        for header in PROXIED_IMAGE_HEADERS:
+            if header in response.headers:
+                headers[header] = response.headers[header]
         
-        # Stream the image
-        async with httpx.AsyncClient() as client:
-            response = await client.get(image_url)
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=404, detail="Image not found")
-            
-            return StreamingResponse(
-                iter([response.content]),
-                media_type=response.headers.get("content-type", "image/jpeg"),
-                headers={
-                    "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
-                    "Content-Length": str(len(response.content))
-                }
-            )
+        media_type = response.headers.get("content-type", "image/jpeg")
+        # Only complete, unencoded bodies go into the disk cache
+        writer = None
+        if response.status_code == 200 and "content-encoding" not in response.headers:
+            writer = await image_cache.open_writer(photo_id, size, media_type, etag)
+        
+        return StreamingResponse(
+            _stream_upstream(response, writer),
+            status_code=response.status_code,
+            media_type=media_type,
+            headers=headers
+        )
             
     except HTTPException:
         raise
@@ -191,6 +1095,116 @@ async def get_photo_image(
         logger.error(f"Error serving image {photo_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to serve image")
 
+# Browser lifetime of a sprite served with blank tiles (uncached on our side too)
+INCOMPLETE_SPRITE_MAX_AGE_SECONDS = 30
+
+def _sprite_page(snapshot: PhotosSnapshot, category: str, page: int, per_page: int) -> Tuple[List[Dict], int]:
+    if category not in ALBUM_IDS:
+        raise HTTPException(status_code=404, detail=f"Unknown category: {category}")
+    photos = snapshot.listing(category)
+    start = page * per_page
+    if start and start >= len(photos):
+        raise HTTPException(status_code=404, detail="Page out of range")
+    return photos[start:start + per_page], len(photos)
+
+async def _sprite_sources(photos: List[Dict]) -> List[Optional[str]]:
+    """Disk-cache paths of each tile's small thumbnail, fetching the ones not cached yet"""
+    semaphore = asyncio.Semaphore(max(1, settings.SPRITE_FETCH_CONCURRENCY))
+    
+    async def fetch(photo: Dict) -> Optional[str]:
+        cached = image_cache.peek(photo["id"], "small")
+        if cached:
+            return cached.path
+        async with semaphore:
+            try:
+                cached = await _download_to_cache(photo, "small")
+            except Exception as e:
+                logger.warning(f"Sprite tile {photo['id']} unavailable: {e}")
+                return None
+        return cached.path if cached else None
+    
+    return await asyncio.gather(*(fetch(photo) for photo in photos))
+
+@router.get("/sprite/{category}/manifest", response_class=ORJSONResponse)
+async def get_sprite_manifest(
+    request: Request,
+    category: str,
+    page: int = Query(0, ge=0),
+    size: str = Query("small", regex="^(small|medium)$"),
+    per_page: int = Query(settings.SPRITE_PAGE_SIZE, ge=1, le=settings.SPRITE_MAX_PAGE_SIZE, alias="perPage")
+):
+    """Tile offsets of a category page's sprite, plus the sprite's URL"""
+    try:
+        snapshot, _ = await _current_snapshot()
+        photos, total_count = _sprite_page(snapshot, category, page, per_page)
+        layout = sprite_layout(photos, size, settings.SPRITE_COLUMNS)
+        version = sprite_version(photos, size, settings.SPRITE_COLUMNS)
+        
+        headers = {"ETag": f'"{version}"', "Cache-Control": "public, max-age=300"}
+        if is_not_modified(request, headers["ETag"], None):
+            return Response(status_code=304, headers=headers)
+        
+        # The version parameter makes the sprite URL change with the page's contents
+        sprite_path = request.url_for("get_category_sprite", category=category).path
+        return ORJSONResponse({
+            "category": category,
+            "page": page,
+            "perPage": per_page,
+            "size": size,
+            "totalCount": total_count,
+            "nextPage": page + 1 if (page + 1) * per_page < total_count else None,
+            "spriteUrl": f"{sprite_path}?page={page}&size={size}&perPage={per_page}&v={version[:16]}",
+            **layout,
+        }, headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building sprite manifest for {category}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build sprite manifest")
+
+@router.get("/sprite/{category}")
+async def get_category_sprite(
+    request: Request,
+    category: str,
+    page: int = Query(0, ge=0),
+    size: str = Query("small", regex="^(small|medium)$"),
+    per_page: int = Query(settings.SPRITE_PAGE_SIZE, ge=1, le=settings.SPRITE_MAX_PAGE_SIZE, alias="perPage")
+):
+    """One image holding every thumbnail of a category page (see the manifest for offsets)"""
+    try:
+        if not image_cache.loaded:
+            # Tiles are composed from disk-cached thumbnails in a worker process
+            raise HTTPException(status_code=503, detail="Sprites need the image cache enabled")
+        
+        fmt = negotiate_format(request.headers.get("accept"))
+        snapshot, _ = await _current_snapshot()
+        photos, _ = _sprite_page(snapshot, category, page, per_page)
+        version = sprite_version(photos, size, settings.SPRITE_COLUMNS)
+        
+        cached = await image_cache.get(sprite_cache_id(category, version), format_variant(size, fmt))
+        if cached:
+            return _serve_cached_image(request, cached, "HIT")
+        
+        layout = sprite_layout(photos, size, settings.SPRITE_COLUMNS)
+        sources = await _sprite_sources(photos)
+        sprite, data = await get_sprite(category, version, size, layout, sources, fmt)
+        if sprite:
+            return _serve_cached_image(request, sprite, "MISS")
+        # Missing tiles: let clients come back soon for the complete sheet
+        max_age = 86400 if all(sources) else INCOMPLETE_SPRITE_MAX_AGE_SECONDS
+        return Response(
+            content=data,
+            media_type=FORMAT_CONTENT_TYPES[fmt],
+            headers={"Cache-Control": f"public, max-age={max_age}", "Vary": "Accept", "X-Cache": "MISS"}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building sprite for {category}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to build sprite")
+
 @router.get("/auth/status")
 async def get_auth_status():
     """Check Google Photos authentication status"""
@@ -198,17 +1212,55 @@ async def get_auth_status():
         access_token = await google_photos_service.get_access_token()
         return {
             "authenticated": True,
-            "token_expires_at": google_photos_service.token_expires_at.isoformat() if google_photos_service.token_expires_at else None
+            "token_expires_at": google_photos_service.token_expires_at.isoformat() if google_photos_service.token_expires_at else None,
+            "token_refresh": google_photos_service.token_refresh_stats()
         }
     except Exception as e:
         return {
             "authenticated": False,
-            "error": str(e)
+            "error": str(e),
+            "token_refresh": google_photos_service.token_refresh_stats()
         }
 
+@router.get("/base-urls/status")
+async def get_base_url_status():
+    """Per-item baseUrl expiry tracking and batchGet refresh counters"""
+    snapshot = photos_cache["snapshot"]
+    tracked = snapshot.base_url_fetched_at if snapshot else {}
+    oldest = min(tracked.values()) if tracked else None
+    return {
+        "tracked": len(tracked),
+        "expired": sum(1 for photo_id in tracked if snapshot.base_url_expired(photo_id)),
+        "nextExpiry": datetime.fromtimestamp(oldest + settings.GOOGLE_BASE_URL_TTL_SECONDS).isoformat() if oldest else None,
+        "pendingLazyRefreshes": len(_pending_base_urls),
+        **google_photos_service.base_url_refresh_stats(),
+    }
+
+@router.get("/http/stats")
+async def get_http_pool_stats():
+    """Connection pool statistics for the shared upstream HTTP client"""
+    return get_pool_stats()
+
+@router.get("/image-cache/stats")
+async def get_image_cache_stats():
+    """Hit/miss and size counters for the on-disk image cache"""
+    return image_cache.stats()
+
+@router.get("/prewarm/status")
+async def get_prewarm_status():
+    """Progress of the background thumbnail pre-warming"""
+    return thumbnail_prewarmer.status()
+
+@router.get("/placeholders/status")
+async def get_placeholder_status():
+    """Progress of background placeholder rendering"""
+    return placeholder_worker.status()
+
 @router.post("/cache/clear")
 async def clear_photos_cache():
-    """Clear the photos cache (admin endpoint)"""
-    photos_cache["data"] = None
+    """Clear the photos cache on every worker (admin endpoint)"""
+    photos_cache["snapshot"] = None
     photos_cache["expires_at"] = None
+    album_placeholders.clear()
+    await shared_photos_cache.clear()
     return {"message": "Cache cleared successfully"}
\ No newline at end of file
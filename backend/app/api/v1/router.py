@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.v1 import auth
-from app.api.v1.endpoints import metrics, photos
+from app.api.v1.endpoints import local_photos, metrics, photos
 
 api_router = APIRouter()
 
@@ -11,4 +11,7 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 # Include photo gallery routes
-api_router.include_router(photos.router, prefix="/photos", tags=["photos"])
\ No newline at end of file
+api_router.include_router(photos.router, prefix="/photos", tags=["photos"])
+
+# Include local (database-backed) photo routes
+api_router.include_router(local_photos.router, prefix="/photos", tags=["local-photos"])
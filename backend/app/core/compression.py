@@ -0,0 +1,99 @@
+# app/core/compression.py
+from typing import Callable, Dict, Optional, Tuple
+import zlib
+
+import orjson
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+try:
+    # Optional: without the brotli package responses are gzip-only
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types worth compressing; images are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, preferring br when available"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def stream_compressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """(process, finish) pair for compressing a body that arrives in chunks.
+    
+    Each processed chunk is flushed so a streamed listing reaches the client
+    as it is produced rather than when the compressor's buffer fills.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+
+def weaken_etag(etag: str) -> str:
+    """Compressed bytes differ from the identity body, so a strong tag no longer applies"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class EncodedJSON:
+    """A JSON body serialised once, with compressed copies made on first use.
+    
+    Built for payloads that stay the same across many requests (an album
+    snapshot), so neither serialisation nor compression repeats per request.
+    """
+    
+    def __init__(self, content):
+        self.body = orjson.dumps(content)
+        self._compressed: Dict[str, bytes] = {}
+    
+    async def response(self, request: Request, headers: Dict[str, str], status_code: int = 200) -> Response:
+        headers = dict(headers)
+        body = self.body
+        encoding = None
+        if len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            if encoding not in self._compressed:
+                # Concurrent first requests may both compress; the result is identical
+                self._compressed[encoding] = await run_in_threadpool(compress, self.body, encoding)
+            body = self._compressed[encoding]
+            headers["Content-Encoding"] = encoding
+            if "ETag" in headers:
+                headers["ETag"] = weaken_etag(headers["ETag"])
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
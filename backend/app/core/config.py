@@ -50,6 +50,82 @@ class Settings(BaseSettings):
             return os.getenv('REDIS_URL', "redis://redis:6379/0")
         return "redis://redis:6379/0"
     
+    # Outbound HTTP client (Google Photos API / googleusercontent)
+    HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+    HTTP_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+    HTTP_CLIENT_MAX_KEEPALIVE: int = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY", "60"))
+    HTTP_CLIENT_TIMEOUT: float = float(os.getenv("HTTP_CLIENT_TIMEOUT", "30"))
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT", "10"))
+    
+    # Google Photos
+    GOOGLE_PHOTOS_ALBUM_CONCURRENCY: int = int(os.getenv("GOOGLE_PHOTOS_ALBUM_CONCURRENCY", "5"))
+    # Renew the OAuth access token this long before it expires
+    GOOGLE_TOKEN_RENEWAL_LEAD_SECONDS: int = int(os.getenv("GOOGLE_TOKEN_RENEWAL_LEAD_SECONDS", "300"))
+    # Wait after a failed renewal, and the shortest gap between renewals
+    GOOGLE_TOKEN_RENEWAL_RETRY_SECONDS: int = int(os.getenv("GOOGLE_TOKEN_RENEWAL_RETRY_SECONDS", "30"))
+    # Album re-crawl interval; only picks up added/removed photos since
+    # baseUrls are renewed per item (see GOOGLE_BASE_URL_TTL_SECONDS below)
+    PHOTOS_CACHE_TTL_SECONDS: int = int(os.getenv("PHOTOS_CACHE_TTL_SECONDS", "21600"))
+    # How long past expiry a stale album list may still be served while it revalidates
+    PHOTOS_CACHE_MAX_STALE_SECONDS: int = int(os.getenv("PHOTOS_CACHE_MAX_STALE_SECONDS", "3600"))
+    # Google baseUrls stop working about 60 minutes after they are issued;
+    # an expired one is renewed through batchGet only when an image needs it
+    GOOGLE_BASE_URL_TTL_SECONDS: int = int(os.getenv("GOOGLE_BASE_URL_TTL_SECONDS", "3600"))
+    # Shared (Redis) tier of the album cache, in front of each worker's own copy
+    PHOTOS_CACHE_REDIS_ENABLED: bool = os.getenv("PHOTOS_CACHE_REDIS_ENABLED", "true").lower() == "true"
+    PHOTOS_CACHE_REDIS_PREFIX: str = os.getenv("PHOTOS_CACHE_REDIS_PREFIX", "photos:albums")
+    PHOTOS_CACHE_REDIS_TIMEOUT: float = float(os.getenv("PHOTOS_CACHE_REDIS_TIMEOUT", "1"))
+    PHOTOS_CACHE_REFRESH_LOCK_SECONDS: int = int(os.getenv("PHOTOS_CACHE_REFRESH_LOCK_SECONDS", "120"))
+    IMAGE_STREAM_CHUNK_SIZE: int = int(os.getenv("IMAGE_STREAM_CHUNK_SIZE", "65536"))
+    
+    # Response compression (gzip, or brotli when the brotli package is installed)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    
+    # Disk cache for proxied image variants (0 bytes disables it)
+    IMAGE_CACHE_DIR: str = os.getenv("IMAGE_CACHE_DIR", "/tmp/dlm-image-cache")
+    IMAGE_CACHE_MAX_BYTES: int = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+    # Workers share the directory; each re-reads it this often to enforce the shared budget
+    IMAGE_CACHE_RESCAN_SECONDS: int = int(os.getenv("IMAGE_CACHE_RESCAN_SECONDS", "60"))
+    
+    # Inline placeholders (tiny base64 WebP) returned with each photo in listings
+    PLACEHOLDER_ENABLED: bool = os.getenv("PLACEHOLDER_ENABLED", "true").lower() == "true"
+    PLACEHOLDER_MAX_SIDE: int = int(os.getenv("PLACEHOLDER_MAX_SIDE", "20"))
+    PLACEHOLDER_QUALITY: int = int(os.getenv("PLACEHOLDER_QUALITY", "40"))
+    PLACEHOLDER_CONCURRENCY: int = int(os.getenv("PLACEHOLDER_CONCURRENCY", "2"))
+    # Rendered placeholders are persisted this many at a time
+    PLACEHOLDER_BATCH_SIZE: int = int(os.getenv("PLACEHOLDER_BATCH_SIZE", "100"))
+    # Batches finished within this interval reach album listings (and other workers) together
+    PLACEHOLDER_PUBLISH_INTERVAL_SECONDS: float = float(os.getenv("PLACEHOLDER_PUBLISH_INTERVAL_SECONDS", "2"))
+    
+    # Contact-sheet sprites of a category page (one image per grid view)
+    SPRITE_COLUMNS: int = int(os.getenv("SPRITE_COLUMNS", "6"))
+    SPRITE_PAGE_SIZE: int = int(os.getenv("SPRITE_PAGE_SIZE", "24"))
+    SPRITE_MAX_PAGE_SIZE: int = int(os.getenv("SPRITE_MAX_PAGE_SIZE", "60"))
+    # Thumbnails fetched from Google in parallel while building a sprite
+    SPRITE_FETCH_CONCURRENCY: int = int(os.getenv("SPRITE_FETCH_CONCURRENCY", "8"))
+    
+    # Thumbnail pre-warming after an album refresh
+    PREWARM_ENABLED: bool = os.getenv("PREWARM_ENABLED", "true").lower() == "true"
+    PREWARM_SIZES: List[str] = os.getenv("PREWARM_SIZES", "small,medium").split(",")
+    PREWARM_CONCURRENCY: int = int(os.getenv("PREWARM_CONCURRENCY", "4"))
+    PREWARM_RATE_PER_SECOND: float = float(os.getenv("PREWARM_RATE_PER_SECOND", "10"))
+    
+    # Local originals and the server-side resize pipeline
+    LOCAL_PHOTOS_DIR: str = os.getenv("LOCAL_PHOTOS_DIR", "/app/photos")
+    # Resize processes; 0 means one per available CPU
+    IMAGE_PROCESS_WORKERS: int = int(os.getenv("IMAGE_PROCESS_WORKERS", "0"))
+    IMAGE_JPEG_QUALITY: int = int(os.getenv("IMAGE_JPEG_QUALITY", "82"))
+    IMAGE_WEBP_QUALITY: int = int(os.getenv("IMAGE_WEBP_QUALITY", "78"))
+    IMAGE_AVIF_QUALITY: int = int(os.getenv("IMAGE_AVIF_QUALITY", "55"))
+    
+    # Local photo listings: per-category counts come from photo_category_stats,
+    # cached per worker this long; search totals stop counting at the cap
+    CATEGORY_STATS_CACHE_SECONDS: float = float(os.getenv("CATEGORY_STATS_CACHE_SECONDS", "5"))
+    SEARCH_COUNT_CAP: int = int(os.getenv("SEARCH_COUNT_CAP", "1000"))
+    
     # JWT Settings
     @property
     def SECRET_KEY(self) -> str:
@@ -0,0 +1,41 @@
+# app/core/http_cache.py
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+
+
+def http_date(timestamp: float) -> str:
+    """Format a POSIX timestamp as an RFC 7231 HTTP date"""
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[float]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since for a GET.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    when the client sent no entity tags (RFC 7232 section 6).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return bool(etag) and etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= int(since)
+
+    return False
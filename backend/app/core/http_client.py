@@ -0,0 +1,109 @@
+# app/core/http_client.py
+from collections import defaultdict
+from typing import Dict, Optional
+import logging
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Single app-lifetime client shared by every outbound Google call so that
+# TCP/TLS (and HTTP/2) connections are reused across requests.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a pooled AsyncClient from settings"""
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but h2 is not installed - falling back to HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_CLIENT_TIMEOUT,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+    )
+    logger.info(
+        f"Creating shared HTTP client (http2={http2}, "
+        f"max_connections={limits.max_connections}, "
+        f"max_keepalive={limits.max_keepalive_connections}, "
+        f"keepalive_expiry={limits.keepalive_expiry}s)"
+    )
+    return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the shared client (called from the app lifespan)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Shared HTTP client closed")
+    _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifespan (scripts, shell)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+def get_pool_stats() -> Dict:
+    """Per-host connection pool statistics for the shared client"""
+    if _client is None or _client.is_closed:
+        return {"active": False, "hosts": {}}
+
+    # httpx does not expose its pool publicly; read the httpcore pool defensively
+    pool = getattr(_client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+
+    hosts: Dict[str, Dict] = defaultdict(lambda: {
+        "connections": 0,
+        "idle": 0,
+        "available": 0,
+        "http2": 0,
+    })
+    for connection in connections:
+        origin = getattr(connection, "_origin", None)
+        host = origin.host.decode() if origin is not None else "unknown"
+        stats = hosts[host]
+        stats["connections"] += 1
+        if connection.is_idle():
+            stats["idle"] += 1
+        if connection.is_available():
+            stats["available"] += 1
+        if "HTTP/2" in connection.info():
+            stats["http2"] += 1
+
+    return {
+        "active": True,
+        "http2": _http2_available() and settings.HTTP_CLIENT_HTTP2,
+        "totalConnections": len(connections),
+        "inFlightRequests": len(getattr(pool, "_requests", []) or []),
+        "hosts": dict(hosts),
+    }
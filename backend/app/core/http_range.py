@@ -0,0 +1,140 @@
+# app/core/http_range.py
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import secrets
+
+import anyio
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from app.core.config import settings
+
+# Requests asking for more ranges than this are served the full body
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range_header(value: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a `Range: bytes=...` header into sorted, merged inclusive ranges.
+
+    Returns None when the header is absent, malformed or uses another unit
+    (the full body should be sent), and raises RangeNotSatisfiable when it
+    is well formed but no range overlaps the representation.
+    """
+    if not value or not value.startswith("bytes="):
+        return None
+
+    ranges = []
+    specs = value[len("bytes="):].split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+    for spec in specs:
+        start_str, sep, end_str = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start_str:
+                start = int(start_str)
+                end = int(end_str) if end_str else size - 1
+                if end_str and end < start:
+                    return None
+            else:
+                # Suffix range: the last N bytes
+                suffix = int(end_str)
+                if suffix <= 0:
+                    continue
+                start = max(size - suffix, 0)
+                end = size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+async def _iter_file_range(path: str, start: int, end: int) -> AsyncIterator[bytes]:
+    chunk_size = settings.IMAGE_STREAM_CHUNK_SIZE
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _iter_multipart(path: str, parts: List[Tuple[bytes, int, int]], closing: bytes) -> AsyncIterator[bytes]:
+    for part_header, start, end in parts:
+        yield part_header
+        async for chunk in _iter_file_range(path, start, end):
+            yield chunk
+    yield closing
+
+
+def file_range_response(
+    path: str,
+    size: int,
+    media_type: str,
+    headers: Dict[str, str],
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None,
+) -> Response:
+    """Serve a local file honouring single and multi-range requests"""
+    headers = {**headers, "Accept-Ranges": "bytes"}
+
+    # If-Range: only honour the range while the client's validator is current
+    if if_range and if_range not in (headers.get("ETag"), headers.get("Last-Modified")):
+        range_header = None
+
+    try:
+        ranges = parse_range_header(range_header, size)
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if ranges is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(_iter_file_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+    boundary = secrets.token_hex(16)
+    parts = []
+    length = 0
+    for start, end in ranges:
+        part_header = (
+            f"--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        # Each part body is followed by CRLF before the next delimiter
+        parts.append((part_header if not parts else b"\r\n" + part_header, start, end))
+        length += len(parts[-1][0]) + end - start + 1
+    closing = f"\r\n--{boundary}--\r\n".encode()
+    length += len(closing)
+
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_multipart(path, parts, closing),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers,
+    )
@@ -0,0 +1,427 @@
+# app/core/image_cache.py
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_SUFFIX = ".img"
+META_SUFFIX = ".json"
+TEMP_PREFIX = ".tmp-"
+LOCK_NAME = ".lock"
+# Temp files this old are removed even if their writer's pid is in use again
+STALE_TEMP_SECONDS = 3600
+
+
+def proxied_etag(photo_id: str, variant: str, upstream_etag: Optional[str]) -> Optional[str]:
+    """Our validator for a variant fetched from Google, known before its body is.
+
+    Derived from the upstream ETag and stored with the cache entry by every
+    path that fills it (streamed MISS, prewarm, placeholder and transcode
+    sources), so cache hits revalidate against the value a MISS sent.
+    """
+    if not upstream_etag:
+        return None
+    digest = hashlib.sha1(f"{photo_id}:{variant}:{upstream_etag}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _temp_prefix() -> str:
+    # The writer's pid lets other workers tell in-flight temp files from abandoned ones
+    return f"{TEMP_PREFIX}{os.getpid()}-"
+
+
+class CachedImage:
+    """Index entry for one cached image variant"""
+    __slots__ = ("key", "path", "size", "content_type", "etag", "stored_at")
+
+    def __init__(self, key: str, path: str, size: int, content_type: str, etag: str, stored_at: float):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.content_type = content_type
+        # Strong validator: proxied_etag() for variants fetched from Google, else a hash of the stored bytes
+        self.etag = etag
+        self.stored_at = stored_at
+
+
+class ImageCacheWriter:
+    """Collects one upstream body into a temp file and publishes it atomically on commit.
+
+    Opens its temp file on construction; create it through
+    DiskImageCache.open_writer so that happens off the event loop.
+    """
+
+    def __init__(self, cache: "DiskImageCache", key: str, content_type: str, etag: Optional[str] = None):
+        self.cache = cache
+        self.key = key
+        self.content_type = content_type
+        # Validator chosen up front (see proxied_etag); otherwise the body hash
+        self.fixed_etag = etag
+        self.digest = hashlib.sha1()
+        self.stored_at = None
+        self.size = 0
+        fd, self.temp_path = tempfile.mkstemp(prefix=_temp_prefix(), dir=cache.directory)
+        self.file = os.fdopen(fd, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self.digest.update(chunk)
+        await run_in_threadpool(self.file.write, chunk)
+
+    @property
+    def etag(self) -> str:
+        return self.fixed_etag or f'"{self.digest.hexdigest()}"'
+
+    async def commit(self) -> None:
+        # Disk work off the event loop, index update back on it
+        if await run_in_threadpool(self.cache._persist, self):
+            evicted = self.cache._register(self)
+            if evicted:
+                await run_in_threadpool(self.cache._unlink_all, evicted)
+
+    async def abort(self) -> None:
+        await run_in_threadpool(self._discard)
+
+    def _discard(self) -> None:
+        try:
+            self.file.close()
+        finally:
+            if os.path.exists(self.temp_path):
+                os.unlink(self.temp_path)
+
+
+class DiskImageCache:
+    """Byte-budgeted LRU cache of image variants on local disk, shared by all workers.
+
+    Each entry is a data file plus a JSON sidecar, both written to a temp
+    file and renamed into place, so a crash never leaves a partial entry
+    under its final name. Every worker keeps its own in-memory index of the
+    directory: entries written by other workers are adopted on a lookup
+    miss, and a periodic rescan rebuilds the index from disk (file mtimes
+    give the LRU order) and evicts against the shared byte budget. Renames,
+    unlinks and scans hold an flock on the directory, so no worker ever
+    reads half an entry.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, rescan_seconds: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self.entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self.total_bytes = 0
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.adopted = 0
+        self.bytes_served = 0
+        self.bytes_written = 0
+        self.evictions = 0
+        self._rescan_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def make_key(photo_id: str, variant: str) -> str:
+        return hashlib.sha1(f"{photo_id}:{variant}".encode()).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + DATA_SUFFIX, base + META_SUFFIX
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock on the directory, across worker processes"""
+        with open(os.path.join(self.directory, LOCK_NAME), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def load(self) -> None:
+        """Build the index from the shared directory (run once per worker at startup)"""
+        if self.max_bytes <= 0:
+            logger.info("Image cache disabled (IMAGE_CACHE_MAX_BYTES=0)")
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._install(*self._scan())
+        self.loaded = True
+        logger.info(f"Image cache loaded: {len(self.entries)} entries, {self.total_bytes} bytes")
+
+    async def rescan(self) -> None:
+        """Pick up other workers' writes and evictions, and enforce the shared budget"""
+        self._install(*await run_in_threadpool(self._scan))
+
+    def _install(self, entries: "OrderedDict[str, CachedImage]", total_bytes: int, evicted: int) -> None:
+        self.entries = entries
+        self.total_bytes = total_bytes
+        self.evictions += evicted
+
+    def _scan(self) -> Tuple["OrderedDict[str, CachedImage]", int, int]:
+        """Read the directory into a fresh index, evicting the least recently used entries over budget.
+
+        Also discards abandoned temp files and incomplete entries.
+        """
+        found = []
+        with self._locked():
+            names = set(os.listdir(self.directory))
+            for name in names:
+                path = os.path.join(self.directory, name)
+                if name.startswith(TEMP_PREFIX):
+                    if self._temp_abandoned(name, path):
+                        self._remove(path)
+                    continue
+                if not name.endswith(DATA_SUFFIX):
+                    continue
+                key = name[:-len(DATA_SUFFIX)]
+                try:
+                    found.append(self._read_entry(key))
+                except Exception as e:
+                    logger.warning(f"Dropping corrupt image cache entry {key}: {e}")
+                    self._unlink(key)
+
+            # Orphaned sidecars (data file never renamed into place)
+            for name in names:
+                if name.endswith(META_SUFFIX) and name[:-len(META_SUFFIX)] + DATA_SUFFIX not in names:
+                    self._remove(os.path.join(self.directory, name))
+
+            entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+            total_bytes = 0
+            for entry, _ in sorted(found, key=lambda item: item[1]):
+                entries[entry.key] = entry
+                total_bytes += entry.size
+            evicted = 0
+            while total_bytes > self.max_bytes and entries:
+                key, entry = entries.popitem(last=False)
+                total_bytes -= entry.size
+                self._unlink(key)
+                evicted += 1
+        return entries, total_bytes, evicted
+
+    def _read_entry(self, key: str) -> Tuple[CachedImage, float]:
+        """Entry and data file mtime from disk; raises when missing or inconsistent"""
+        data_path, meta_path = self._paths(key)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stat = os.stat(data_path)
+        if stat.st_size != meta["size"]:
+            raise ValueError("size mismatch")
+        entry = CachedImage(key, data_path, meta["size"], meta["content_type"], meta["etag"], meta["stored_at"])
+        return entry, stat.st_mtime
+
+    def _find_on_disk(self, key: str) -> Optional[CachedImage]:
+        with self._locked():
+            try:
+                entry, _ = self._read_entry(key)
+            except (OSError, ValueError, KeyError):
+                return None
+        return entry
+
+    @staticmethod
+    def _temp_abandoned(name: str, path: str) -> bool:
+        """Whether a temp file's writer is gone (or it has been sitting there far too long)"""
+        try:
+            pid = int(name[len(TEMP_PREFIX):].split("-", 1)[0])
+        except ValueError:
+            return True
+        if pid != os.getpid():
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        try:
+            return time.time() - os.stat(path).st_mtime > STALE_TEMP_SECONDS
+        except FileNotFoundError:
+            return False
+
+    def start_rescans(self) -> None:
+        """Start the periodic rescan (called from the app lifespan)"""
+        if not self.loaded or self.rescan_seconds <= 0:
+            return
+        if self._rescan_task is None or self._rescan_task.done():
+            self._rescan_task = asyncio.create_task(self._rescan_loop())
+
+    async def stop_rescans(self) -> None:
+        if self._rescan_task is not None:
+            self._rescan_task.cancel()
+            try:
+                await self._rescan_task
+            except asyncio.CancelledError:
+                pass
+            self._rescan_task = None
+
+    async def _rescan_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.rescan_seconds)
+            try:
+                await self.rescan()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Image cache rescan failed: {e}")
+
+    async def get(self, photo_id: str, variant: str) -> Optional[CachedImage]:
+        key = self.make_key(photo_id, variant)
+        entry = self.entries.get(key)
+        if entry is None and self.loaded:
+            # Another worker may have cached it since our last rescan
+            entry = await run_in_threadpool(self._find_on_disk, key)
+            if entry is not None:
+                self._adopt(entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            # Persist recency for every worker's rescan
+            await run_in_threadpool(os.utime, entry.path)
+        except FileNotFoundError:
+            # Evicted by another worker
+            if self.entries.get(key) is entry:
+                self._drop(key)
+            self.misses += 1
+            return None
+        if self.entries.get(key) is not entry:
+            # Evicted or replaced while we were touching it
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.bytes_served += entry.size
+        return entry
+
+    def _adopt(self, entry: CachedImage) -> None:
+        previous = self.entries.get(entry.key)
+        if previous is not None:
+            self.total_bytes -= previous.size
+        self.entries[entry.key] = entry
+        self.total_bytes += entry.size
+        self.adopted += 1
+
+    def peek(self, photo_id: str, variant: str) -> Optional[CachedImage]:
+        """Look up an entry without touching recency or hit counters"""
+        return self.entries.get(self.make_key(photo_id, variant))
+
+    async def put(self, photo_id: str, variant: str, content_type: str, data: bytes, etag: Optional[str] = None) -> Optional[CachedImage]:
+        """Store a whole variant; returns None when the cache is unavailable.
+
+        `etag` overrides the body-hash validator (see proxied_etag).
+        """
+        writer = await self.open_writer(photo_id, variant, content_type, etag)
+        if writer is None:
+            return None
+        try:
+            await writer.write(data)
+            await writer.commit()
+        except OSError as e:
+            logger.warning(f"Failed to cache image variant: {e}")
+            await writer.abort()
+            return None
+        return self.entries.get(writer.key)
+
+    async def open_writer(self, photo_id: str, variant: str, content_type: str, etag: Optional[str] = None) -> Optional[ImageCacheWriter]:
+        """Start caching a variant; returns None when the cache is unavailable"""
+        if not self.loaded:
+            return None
+        try:
+            return await run_in_threadpool(ImageCacheWriter, self, self.make_key(photo_id, variant), content_type, etag)
+        except OSError as e:
+            logger.warning(f"Image cache unavailable: {e}")
+            return None
+
+    def _persist(self, writer: ImageCacheWriter) -> bool:
+        writer.file.flush()
+        os.fsync(writer.file.fileno())
+        writer.file.close()
+        if writer.size > self.max_bytes:
+            os.unlink(writer.temp_path)
+            return False
+
+        data_path, meta_path = self._paths(writer.key)
+        writer.stored_at = time.time()
+        fd, meta_temp = tempfile.mkstemp(prefix=_temp_prefix(), dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"size": writer.size, "content_type": writer.content_type, "etag": writer.etag, "stored_at": writer.stored_at}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # Sidecar first: a data file is only trusted once its sidecar exists.
+        # Locked so no other worker reads the new sidecar with the old data.
+        with self._locked():
+            os.replace(meta_temp, meta_path)
+            os.replace(writer.temp_path, data_path)
+        return True
+
+    def _register(self, writer: ImageCacheWriter) -> List[str]:
+        """Index a persisted entry; returns the evicted keys whose files still need unlinking"""
+        data_path, _ = self._paths(writer.key)
+        if writer.key in self.entries:
+            self.total_bytes -= self.entries[writer.key].size
+        self.entries[writer.key] = CachedImage(writer.key, data_path, writer.size, writer.content_type, writer.etag, writer.stored_at)
+        self.entries.move_to_end(writer.key)
+        self.total_bytes += writer.size
+        self.bytes_written += writer.size
+        return self._evict()
+
+    def _evict(self) -> List[str]:
+        """Drop least recently used entries from the index until within budget"""
+        evicted = []
+        while self.total_bytes > self.max_bytes and self.entries:
+            key, _ = next(iter(self.entries.items()))
+            self._drop(key)
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _drop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def _unlink_all(self, keys: List[str]) -> None:
+        with self._locked():
+            for key in keys:
+                # Skip keys re-cached since they were evicted
+                if key not in self.entries:
+                    self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        for path in self._paths(key):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.loaded,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "adopted": self.adopted,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+            "bytesServed": self.bytes_served,
+            "bytesWritten": self.bytes_written,
+            "evictions": self.evictions,
+        }
+
+
+image_cache = DiskImageCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES, settings.IMAGE_CACHE_RESCAN_SECONDS)
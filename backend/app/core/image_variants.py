@@ -0,0 +1,220 @@
+# app/core/image_variants.py
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import io
+import logging
+import os
+
+from PIL import Image, ImageOps, features
+
+from app.core.config import settings
+from app.core.image_cache import CachedImage, image_cache
+
+logger = logging.getLogger(__name__)
+
+# Longest edge per size variant, matching the Google Photos proxy sizes
+VARIANT_MAX_SIDE = {
+    "small": 400,
+    "medium": 800,
+    "large": 1200,
+    "full": 2048,
+}
+
+# Output formats in server preference order, with the PIL encoder for each
+FORMAT_CONTENT_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Renders in flight, keyed by cache key, so concurrent misses share one job
+_pending: Dict[str, asyncio.Task] = {}
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container CPU affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        workers = settings.IMAGE_PROCESS_WORKERS or available_cpus()
+        logger.info(f"Starting image resize pool with {workers} processes")
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _encoder_available(fmt: str) -> bool:
+    if fmt == "jpeg":
+        return True
+    try:
+        return bool(features.check_module(fmt))
+    except ValueError:
+        # Pillow too old to know about the format at all
+        return False
+
+
+SUPPORTED_FORMATS = [fmt for fmt in FORMAT_CONTENT_TYPES if _encoder_available(fmt)]
+
+
+def format_quality(fmt: str) -> int:
+    return {
+        "avif": settings.IMAGE_AVIF_QUALITY,
+        "webp": settings.IMAGE_WEBP_QUALITY,
+    }.get(fmt, settings.IMAGE_JPEG_QUALITY)
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick the best output format the client explicitly accepts.
+
+    Only explicitly listed types count: `*/*` and `image/*` fall back to
+    JPEG so older clients never receive a format they cannot decode.
+    """
+    if not accept:
+        return "jpeg"
+    accepted = set()
+    for item in accept.split(","):
+        media_type, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(media_type.strip().lower())
+    for fmt in SUPPORTED_FORMATS:
+        if FORMAT_CONTENT_TYPES[fmt] in accepted:
+            return fmt
+    return "jpeg"
+
+
+def format_variant(variant: str, fmt: str) -> str:
+    """Cache variant name; JPEG keeps the bare size name"""
+    return variant if fmt == "jpeg" else f"{variant}.{fmt}"
+
+
+def render_variant(source_path: str, max_side: Optional[int], fmt: str, quality: int) -> bytes:
+    """Decode, optionally downscale, and encode one image (runs in a worker process).
+
+    For JPEG sources draft() lets libjpeg decode at 1/2, 1/4 or 1/8 scale,
+    so a 24MP original is never fully decoded just to make a thumbnail.
+    """
+    with Image.open(source_path) as image:
+        if max_side:
+            image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if max_side:
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+        return encode_image(image, fmt, quality)
+
+
+def encode_image(image: Image.Image, fmt: str, quality: int) -> bytes:
+    output = io.BytesIO()
+    if fmt == "jpeg":
+        image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "webp":
+        image.save(output, format="WEBP", quality=quality, method=4)
+    else:
+        image.save(output, format="AVIF", quality=quality)
+    return output.getvalue()
+
+
+def _cache_id(source_path: str, mtime_ns: int) -> str:
+    # The source mtime is part of the key so edited originals get new variants
+    return f"local:{source_path}:{mtime_ns}"
+
+
+async def render_in_pool(render: Callable[..., bytes], *args) -> bytes:
+    """Run `render(*args)` in the process pool without caching the result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), render, *args)
+
+
+async def _render_and_store(
+    cache_id: str,
+    cache_variant: str,
+    fmt: str,
+    render: Callable[..., bytes],
+    *args,
+) -> Tuple[Optional[CachedImage], Optional[bytes]]:
+    data = await render_in_pool(render, *args)
+    entry = await image_cache.put(cache_id, cache_variant, FORMAT_CONTENT_TYPES[fmt], data)
+    return (entry, None) if entry else (None, data)
+
+
+async def get_or_render(
+    cache_id: str,
+    cache_variant: str,
+    fmt: str,
+    render: Callable[..., bytes],
+    *args,
+) -> Tuple[Optional[CachedImage], Optional[bytes]]:
+    """Serve from the disk cache or run `render(*args)` once in the process pool.
+
+    Concurrent misses for the same cache entry share one render.
+    """
+    cached = await image_cache.get(cache_id, cache_variant)
+    if cached:
+        return cached, None
+
+    key = image_cache.make_key(cache_id, cache_variant)
+    task = _pending.get(key)
+    if task is None:
+        task = asyncio.create_task(_render_and_store(cache_id, cache_variant, fmt, render, *args))
+        _pending[key] = task
+        task.add_done_callback(lambda _: _pending.pop(key, None))
+
+    # Shielded so one disconnecting client does not cancel the shared render
+    return await asyncio.shield(task)
+
+
+async def get_local_variant(source_path: str, variant: str, fmt: str = "jpeg") -> Tuple[Optional[CachedImage], Optional[bytes]]:
+    """Return a resized variant of a local original in the given format.
+
+    Gives back the disk-cache entry when the image cache is enabled,
+    otherwise the rendered bytes.
+    """
+    mtime_ns = os.stat(source_path).st_mtime_ns
+    return await get_or_render(
+        _cache_id(source_path, mtime_ns),
+        format_variant(variant, fmt),
+        fmt,
+        render_variant,
+        source_path,
+        VARIANT_MAX_SIDE[variant],
+        fmt,
+        format_quality(fmt),
+    )
+
+
+async def get_transcoded_variant(photo_id: str, variant: str, source: CachedImage, fmt: str) -> Tuple[Optional[CachedImage], Optional[bytes]]:
+    """Transcode an already cached (JPEG) variant to another format, stored alongside it"""
+    return await get_or_render(
+        photo_id,
+        format_variant(variant, fmt),
+        fmt,
+        render_variant,
+        source.path,
+        None,
+        fmt,
+        format_quality(fmt),
+    )
@@ -0,0 +1,61 @@
+# app/core/photo_listing.py
+"""Column-projected listings for the local photo endpoints.
+
+Listing queries select only the columns the API returns, as plain row
+tuples, and a single row-mapper turns each row into its response dict.
+No Photo objects are hydrated or tracked by the session. The dicts go
+straight to orjson, which also encodes created_at natively, so there
+is no per-row isoformat().
+
+Each photo carries `baseUrl`, the original file, and `imageUrl`, the
+resized variant endpoint. Grids should use `imageUrl` (medium by default)
+and append `?size=small|large|full|original` for other sizes.
+"""
+from typing import Dict, Iterable, List
+from urllib.parse import quote
+
+from sqlalchemy.orm import Query
+
+from app.models.photo import Photo
+
+# Server-side resized variants of a local photo (see local_photos.get_local_photo_image)
+LOCAL_IMAGE_URL = "/api/v1/photos/local/image/{category}/{filename}"
+
+# Row layout produced by listing_query(); photo_row() indexes by position
+LISTING_COLUMNS = (
+    Photo.id,
+    Photo.category,
+    Photo.filename,
+    Photo.title,
+    Photo.description,
+    Photo.width,
+    Photo.height,
+    Photo.created_at,
+    Photo.placeholder,
+)
+
+
+def listing_query(query: Query, *extra) -> Query:
+    """Re-target a Photo query (filters, joins, ordering kept) at the listing columns"""
+    return query.with_entities(*LISTING_COLUMNS, *extra)
+
+
+def photo_row(row) -> Dict:
+    """API dict for one listing row; trailing extra columns are ignored"""
+    photo_id, category, filename = row[0], row[1], row[2]
+    return {
+        "id": str(photo_id),
+        "category": category,
+        "filename": filename,
+        "description": row[4] or row[3] or filename,
+        "baseUrl": f"/photos/{category}/{filename}",
+        "imageUrl": LOCAL_IMAGE_URL.format(category=category, filename=quote(filename)),
+        "width": row[5] or 800,
+        "height": row[6] or 600,
+        "creationTime": row[7],
+        "placeholder": row[8],
+    }
+
+
+def photo_rows(rows: Iterable) -> List[Dict]:
+    return [photo_row(row) for row in rows]
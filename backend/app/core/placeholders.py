@@ -0,0 +1,192 @@
+# app/core/placeholders.py
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import base64
+import hashlib
+import io
+import logging
+import time
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.image_variants import encode_image, get_process_pool
+
+logger = logging.getLogger(__name__)
+
+# Where a job's image comes from: a local file path or the image bytes
+PlaceholderSource = Union[str, bytes]
+
+# (photo key, coroutine function producing the source image)
+PlaceholderJob = Tuple[str, Callable[[], Awaitable[Optional[PlaceholderSource]]]]
+
+
+def render_placeholder(source: PlaceholderSource, max_side: int, quality: int) -> str:
+    """Tiny WebP preview as a data URI, small enough to inline in listings (runs in a worker process)"""
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as image:
+        image.draft("RGB", (max_side * 8, max_side * 8))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+        data = encode_image(image, "webp", quality)
+    return "data:image/webp;base64," + base64.b64encode(data).decode()
+
+
+def _entry_hash(key: str, value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{key}\0{value}".encode(), digest_size=8).digest(), "big")
+
+
+class PlaceholderMap:
+    """Placeholders by photo key, kept apart from the listing they decorate.
+
+    Listings merge these in when they are encoded, so new placeholders do
+    not rebuild (or republish) the list itself. `digest` is an
+    order-independent hash of the contents: processes holding the same
+    placeholders get the same value however they arrived, which keeps
+    ETags built from it equal across workers.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        # Bumped on every change; keys caches of bodies encoded with this map
+        self.version = 0
+        self.modified_at = 0.0
+        self._digest = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    @property
+    def digest(self) -> str:
+        return f"{self._digest:016x}"
+
+    def update(self, placeholders: Dict[str, str], modified_at: Optional[float] = None) -> int:
+        """Add or replace placeholders; returns how many changed"""
+        changed = 0
+        for key, value in placeholders.items():
+            old = self.values.get(key)
+            if old == value:
+                continue
+            if old is not None:
+                self._digest ^= _entry_hash(key, old)
+            self._digest ^= _entry_hash(key, value)
+            self.values[key] = value
+            changed += 1
+        if changed:
+            self.version += 1
+            self.modified_at = max(self.modified_at, modified_at or time.time())
+        return changed
+
+    def retain(self, keys) -> None:
+        """Drop placeholders for keys no longer listed"""
+        removed = [key for key in self.values if key not in keys]
+        for key in removed:
+            self._digest ^= _entry_hash(key, self.values.pop(key))
+        if removed:
+            self.version += 1
+
+    def clear(self) -> None:
+        self.values = {}
+        self._digest = 0
+        self.version += 1
+
+
+class PlaceholderWorker:
+    """Background generator of inline image placeholders.
+
+    Each photo is rendered once; results are handed to `store` in batches
+    so callers can persist and publish them without doing that once per
+    photo.
+    """
+
+    def __init__(self, concurrency: int, store: Callable[[Dict[str, str]], Awaitable[None]]):
+        self.concurrency = max(1, concurrency)
+        self.store = store
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.queued: Set[str] = set()
+        # Photos whose image could not be read; not retried by this process
+        self.failed_keys: Set[str] = set()
+        self.results: Dict[str, str] = {}
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_workers(self) -> None:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        while len(self.workers) < self.concurrency:
+            self.workers.append(asyncio.create_task(self._worker()))
+
+    def schedule(self, jobs: Iterable[PlaceholderJob]) -> int:
+        """Queue photos that are not already queued; returns how many were added"""
+        if not settings.PLACEHOLDER_ENABLED:
+            return 0
+        added = 0
+        for key, source in jobs:
+            if key in self.queued or key in self.failed_keys:
+                continue
+            if added == 0:
+                self._ensure_workers()
+            self.queued.add(key)
+            self.queue.put_nowait((key, source))
+            added += 1
+        if added:
+            logger.info(f"Scheduled {added} placeholders")
+        return added
+
+    async def _flush(self) -> None:
+        results, self.results = self.results, {}
+        if not results:
+            return
+        try:
+            await self.store(results)
+        except Exception as e:
+            logger.warning(f"Storing {len(results)} placeholders failed: {e}")
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            key, source = await self.queue.get()
+            try:
+                image = await source()
+                if image is None:
+                    raise ValueError("image unavailable")
+                self.results[key] = await loop.run_in_executor(
+                    get_process_pool(),
+                    render_placeholder,
+                    image,
+                    settings.PLACEHOLDER_MAX_SIDE,
+                    settings.PLACEHOLDER_QUALITY,
+                )
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                self.failed_keys.add(key)
+                logger.debug(f"Placeholder for {key} failed: {e}")
+            finally:
+                self.queued.discard(key)
+                self.queue.task_done()
+            if len(self.results) >= settings.PLACEHOLDER_BATCH_SIZE or not self.queued:
+                await self._flush()
+
+    async def stop(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        # Keep what was rendered before shutdown
+        await self._flush()
+
+    def status(self) -> Dict:
+        return {
+            "running": bool(self.queued),
+            "pending": len(self.queued),
+            "completed": self.completed,
+            "failed": self.failed,
+            "unstored": len(self.results),
+        }
@@ -0,0 +1,201 @@
+# app/core/shared_cache.py
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+import uuid
+import zlib
+
+import orjson
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker so it can ignore its own invalidation messages
+WORKER_ID = uuid.uuid4().hex
+
+# How long to stop talking to Redis after a failure
+REDIS_BACKOFF_SECONDS = 30
+
+
+def encode_photos(photos: List[Dict], fetched_at: float, base_url_fetched_at: Optional[Dict[str, float]] = None) -> bytes:
+    """Compact binary form of an album crawl: zlib-compressed minified JSON"""
+    payload = orjson.dumps({
+        "fetched_at": fetched_at,
+        "base_url_fetched_at": base_url_fetched_at or {},
+        "photos": photos,
+    })
+    return zlib.compress(payload, 6)
+
+
+def decode_photos(blob: bytes) -> Tuple[List[Dict], float, Dict[str, float]]:
+    payload = orjson.loads(zlib.decompress(blob))
+    return payload["photos"], payload["fetched_at"], payload.get("base_url_fetched_at") or {}
+
+
+class SharedPhotosCache:
+    """Redis-backed L2 for the album list, shared by every worker.
+
+    Workers keep their own in-process L1 and use this tier to avoid
+    re-crawling Google when another worker already has, to elect a single
+    refresher through a Redis lock, and to broadcast invalidations over
+    pub/sub. Every operation degrades to a no-op when Redis is unavailable.
+    """
+
+    def __init__(self, client: Optional[aioredis.Redis], prefix: str):
+        self.client = client
+        self.payload_key = f"{prefix}:payload"
+        self.lock_key = f"{prefix}:lock"
+        # Placeholders live in their own hash so adding some never rewrites the payload
+        self.placeholders_key = f"{prefix}:placeholders"
+        self.channel = f"{prefix}:events"
+        self._unavailable_until = 0.0
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._unavailable_until
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        logger.warning(f"Shared photos cache {operation} failed, using local cache only: {error}")
+        self._unavailable_until = time.monotonic() + REDIS_BACKOFF_SECONDS
+
+    async def load(self) -> Optional[Tuple[List[Dict], float, Dict[str, float]]]:
+        """Fetch the shared album list as (photos, fetched_at, per-item baseUrl timestamps)"""
+        if not self.available:
+            return None
+        try:
+            blob = await self.client.get(self.payload_key)
+            # Decoding a large album list takes long enough to stall the event loop
+            return await run_in_threadpool(decode_photos, blob) if blob else None
+        except (RedisError, OSError, ValueError, zlib.error) as e:
+            self._failed("load", e)
+            return None
+
+    async def store(self, photos: List[Dict], fetched_at: float, etag: str, base_url_fetched_at: Optional[Dict[str, float]] = None) -> None:
+        """Publish a new album list to every worker"""
+        if not self.available:
+            return
+        # Redis drops the copy once it is past the max-stale bound
+        ttl = settings.PHOTOS_CACHE_TTL_SECONDS + settings.PHOTOS_CACHE_MAX_STALE_SECONDS
+        try:
+            blob = await run_in_threadpool(encode_photos, photos, fetched_at, base_url_fetched_at)
+            await self.client.set(self.payload_key, blob, ex=ttl)
+            await self._publish({"op": "update", "etag": etag})
+        except (RedisError, OSError) as e:
+            self._failed("store", e)
+
+    async def store_placeholders(self, placeholders: Dict[str, str], modified_at: float) -> None:
+        """Add placeholders to the shared hash and tell the other workers which ones"""
+        if not self.available or not placeholders:
+            return
+        ttl = settings.PHOTOS_CACHE_TTL_SECONDS + settings.PHOTOS_CACHE_MAX_STALE_SECONDS
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hset(self.placeholders_key, mapping=placeholders)
+                pipe.expire(self.placeholders_key, ttl)
+                await pipe.execute()
+            await self._publish({"op": "placeholders", "ids": list(placeholders), "modified_at": modified_at})
+        except (RedisError, OSError) as e:
+            self._failed("store placeholders", e)
+
+    async def load_placeholders(self, photo_ids: Optional[List[str]] = None) -> Dict[str, str]:
+        """Shared placeholders, all of them or just the given ids"""
+        if not self.available:
+            return {}
+        try:
+            if photo_ids is None:
+                raw = await self.client.hgetall(self.placeholders_key)
+                return {key.decode(): value.decode() for key, value in raw.items()}
+            values = await self.client.hmget(self.placeholders_key, photo_ids)
+            return {photo_id: value.decode() for photo_id, value in zip(photo_ids, values) if value is not None}
+        except (RedisError, OSError) as e:
+            self._failed("load placeholders", e)
+            return {}
+
+    async def clear(self) -> None:
+        if not self.available:
+            return
+        try:
+            await self.client.delete(self.payload_key, self.placeholders_key)
+            await self._publish({"op": "clear"})
+        except (RedisError, OSError) as e:
+            self._failed("clear", e)
+
+    async def _publish(self, message: Dict) -> None:
+        await self.client.publish(self.channel, orjson.dumps({**message, "origin": WORKER_ID}))
+
+    def refresh_lock(self):
+        """Cross-worker lock so only one worker re-crawls Google at a time"""
+        if not self.available:
+            return None
+        return self.client.lock(self.lock_key, timeout=settings.PHOTOS_CACHE_REFRESH_LOCK_SECONDS)
+
+    async def try_acquire(self, lock) -> bool:
+        try:
+            return await lock.acquire(blocking=False)
+        except (RedisError, OSError) as e:
+            self._failed("lock", e)
+            return False
+
+    async def release(self, lock) -> None:
+        try:
+            await lock.release()
+        except (RedisError, OSError) as e:
+            # Lock expired or Redis went away; it times out on its own
+            logger.debug(f"Releasing photos refresh lock failed: {e}")
+
+    async def _listen(self, on_message: Callable[[Dict], Awaitable[None]]) -> None:
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                while True:
+                    # Poll with a timeout rather than listen() so the socket
+                    # timeout used for regular commands does not break the wait
+                    raw = await pubsub.get_message(timeout=1.0)
+                    if raw is None:
+                        continue
+                    message = orjson.loads(raw["data"])
+                    if message.get("origin") != WORKER_ID:
+                        await on_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Photos cache invalidation listener error: {e}")
+                await asyncio.sleep(REDIS_BACKOFF_SECONDS)
+            finally:
+                await pubsub.close()
+
+    def start_listener(self, on_message: Callable[[Dict], Awaitable[None]]) -> None:
+        if self.client is None:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(on_message))
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+def create_shared_photos_cache() -> SharedPhotosCache:
+    client = None
+    if settings.PHOTOS_CACHE_REDIS_ENABLED:
+        client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.PHOTOS_CACHE_REDIS_TIMEOUT,
+            socket_timeout=settings.PHOTOS_CACHE_REDIS_TIMEOUT,
+        )
+    return SharedPhotosCache(client, settings.PHOTOS_CACHE_REDIS_PREFIX)
+
+
+shared_photos_cache = create_shared_photos_cache()
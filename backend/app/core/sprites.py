@@ -0,0 +1,114 @@
+# app/core/sprites.py
+from typing import Dict, List, Optional, Tuple
+import hashlib
+
+from PIL import Image, ImageOps
+
+from app.core.image_cache import CachedImage
+from app.core.image_variants import encode_image, format_quality, format_variant, get_or_render, render_in_pool
+
+# Edge of one grid cell per sprite size; tiles are fitted inside it
+SPRITE_TILE_SIDE = {
+    "small": 200,
+    "medium": 400,
+}
+
+# Fill for empty cells and the margins around non-square tiles
+SPRITE_BACKGROUND = (24, 24, 24)
+
+# (source path or None, x, y, width, height)
+SpriteTile = Tuple[Optional[str], int, int, int, int]
+
+
+def _photo_dimensions(photo: Dict) -> Tuple[int, int]:
+    metadata = photo.get("mediaMetadata") or {}
+    try:
+        width, height = int(metadata.get("width")), int(metadata.get("height"))
+    except (TypeError, ValueError):
+        return 1, 1
+    return (width, height) if width > 0 and height > 0 else (1, 1)
+
+
+def sprite_layout(photos: List[Dict], size: str, columns: int) -> Dict:
+    """Place one page of photos on a grid, each fitted and centred in its cell.
+
+    Offsets come from the photos' metadata alone, so the manifest can be
+    answered without fetching a single thumbnail.
+    """
+    side = SPRITE_TILE_SIDE[size]
+    columns = max(1, min(columns, len(photos) or 1))
+    rows = (len(photos) + columns - 1) // columns
+    tiles = []
+    for index, photo in enumerate(photos):
+        width, height = _photo_dimensions(photo)
+        scale = side / max(width, height)
+        tile_width = max(1, round(width * scale))
+        tile_height = max(1, round(height * scale))
+        cell_x = (index % columns) * side
+        cell_y = (index // columns) * side
+        tiles.append({
+            "id": photo["id"],
+            "x": cell_x + (side - tile_width) // 2,
+            "y": cell_y + (side - tile_height) // 2,
+            "width": tile_width,
+            "height": tile_height,
+        })
+    return {
+        "width": columns * side,
+        "height": rows * side,
+        "tileSize": side,
+        "columns": columns,
+        "tiles": tiles,
+    }
+
+
+def sprite_version(photos: List[Dict], size: str, columns: int) -> str:
+    """Content key for a sprite page; changes when the page's photos or layout do"""
+    ids = ",".join(photo["id"] for photo in photos)
+    return hashlib.sha1(f"{size}:{columns}:{ids}".encode()).hexdigest()
+
+
+def render_sprite(width: int, height: int, tiles: List[SpriteTile], fmt: str, quality: int) -> bytes:
+    """Compose thumbnails into one sheet (runs in a worker process)"""
+    sheet = Image.new("RGB", (width, height), SPRITE_BACKGROUND)
+    for path, x, y, tile_width, tile_height in tiles:
+        if not path:
+            continue
+        try:
+            with Image.open(path) as image:
+                image.draft("RGB", (tile_width, tile_height))
+                image = ImageOps.exif_transpose(image).convert("RGB")
+                # Crop to the manifest box in case metadata and pixels disagree slightly
+                sheet.paste(ImageOps.fit(image, (tile_width, tile_height), Image.LANCZOS), (x, y))
+        except OSError:
+            # Unreadable thumbnail: leave the cell empty rather than fail the sheet
+            continue
+    return encode_image(sheet, fmt, quality)
+
+
+def sprite_cache_id(category: str, version: str) -> str:
+    return f"sprite:{category}:{version}"
+
+
+async def get_sprite(
+    category: str,
+    version: str,
+    size: str,
+    layout: Dict,
+    sources: List[Optional[str]],
+    fmt: str = "jpeg",
+) -> Tuple[Optional[CachedImage], Optional[bytes]]:
+    """Render (or reuse) the sprite for one category page.
+
+    A sheet with missing tiles (thumbnail fetch failed) is rendered but not
+    cached, so the next request retries those tiles instead of the hole
+    being stored under the page's version for good.
+    """
+    tiles = [
+        (source, tile["x"], tile["y"], tile["width"], tile["height"])
+        for source, tile in zip(sources, layout["tiles"])
+    ]
+    args = (layout["width"], layout["height"], tiles, fmt, format_quality(fmt))
+    if not all(sources):
+        return None, await render_in_pool(render_sprite, *args)
+    return await get_or_render(sprite_cache_id(category, version), format_variant(size, fmt), fmt, render_sprite, *args)
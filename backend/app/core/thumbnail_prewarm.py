@@ -0,0 +1,137 @@
+# app/core/thumbnail_prewarm.py
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+from app.core.image_cache import image_cache, proxied_etag
+
+logger = logging.getLogger(__name__)
+
+# (photo id, size variant, upstream URL)
+PrewarmJob = Tuple[str, str, str]
+
+
+class ThumbnailPrewarmer:
+    """Background fetcher that fills the image cache ahead of the first visitor.
+
+    Jobs go through a queue drained by a fixed number of workers; every
+    upstream request also waits for a slot from a simple interval-based
+    rate limiter so a large album refresh cannot burst against Google.
+    """
+
+    def __init__(self, concurrency: int, rate_per_second: float):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.queued: Set[Tuple[str, str]] = set()
+        self._next_slot = 0.0
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.scheduled = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_fetched = 0
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def _ensure_workers(self) -> None:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+            self._rate_lock = asyncio.Lock()
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        while len(self.workers) < self.concurrency:
+            self.workers.append(asyncio.create_task(self._worker()))
+
+    def schedule(self, jobs: Iterable[PrewarmJob]) -> int:
+        """Queue variants that are not cached or already queued; returns how many were added"""
+        if not image_cache.loaded:
+            return 0
+        added = 0
+        for photo_id, variant, url in jobs:
+            if (photo_id, variant) in self.queued or image_cache.peek(photo_id, variant):
+                continue
+            if added == 0:
+                self._ensure_workers()
+                if self.queue.empty() and not self.queued:
+                    self.reset_stats()
+                    self.started_at = datetime.now()
+            self.queued.add((photo_id, variant))
+            self.queue.put_nowait((photo_id, variant, url))
+            added += 1
+        self.scheduled += added
+        if added:
+            logger.info(f"Scheduled {added} thumbnails for pre-warming")
+        return added
+
+    async def _wait_for_slot(self) -> None:
+        if not self.min_interval:
+            return
+        async with self._rate_lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _worker(self) -> None:
+        while True:
+            photo_id, variant, url = await self.queue.get()
+            try:
+                if image_cache.peek(photo_id, variant):
+                    self.skipped += 1
+                    continue
+                await self._wait_for_slot()
+                response = await get_http_client().get(url)
+                if response.status_code != 200:
+                    raise ValueError(f"upstream returned {response.status_code}")
+                await image_cache.put(
+                    photo_id,
+                    variant,
+                    response.headers.get("content-type", "image/jpeg"),
+                    response.content,
+                    proxied_etag(photo_id, variant, response.headers.get("etag"))
+                )
+                self.completed += 1
+                self.bytes_fetched += len(response.content)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.debug(f"Pre-warming {photo_id} ({variant}) failed: {e}")
+            finally:
+                self.queued.discard((photo_id, variant))
+                self.queue.task_done()
+                if not self.queued:
+                    self.finished_at = datetime.now()
+
+    async def stop(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def status(self) -> Dict:
+        return {
+            "running": bool(self.queued),
+            "pending": len(self.queued),
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "bytesFetched": self.bytes_fetched,
+            "concurrency": self.concurrency,
+            "ratePerSecond": round(1 / self.min_interval, 2) if self.min_interval else None,
+            "startedAt": self.started_at.isoformat() if self.started_at else None,
+            "finishedAt": self.finished_at.isoformat() if self.finished_at and not self.queued else None,
+        }
+
+
+thumbnail_prewarmer = ThumbnailPrewarmer(settings.PREWARM_CONCURRENCY, settings.PREWARM_RATE_PER_SECOND)
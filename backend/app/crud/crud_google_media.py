@@ -0,0 +1,175 @@
+# app/crud/crud_google_media.py
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.models.google_media_item import GoogleMediaItem
+
+# Columns compared to decide whether a stored row needs an update
+SYNCED_FIELDS = ("position", "filename", "description", "base_url",
+                 "width", "height", "creation_time", "media_metadata")
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _row_values(photo: Dict, position: int) -> Dict:
+    metadata = photo.get("mediaMetadata") or {}
+    return {
+        "position": position,
+        "filename": photo["filename"],
+        "description": photo.get("description") or "",
+        "base_url": photo["baseUrl"],
+        "width": _parse_int(metadata.get("width")),
+        "height": _parse_int(metadata.get("height")),
+        "creation_time": _parse_time(photo.get("creationTime")),
+        "media_metadata": metadata,
+    }
+
+def _same(row: GoogleMediaItem, values: Dict) -> bool:
+    for field in SYNCED_FIELDS:
+        current = getattr(row, field)
+        wanted = values[field]
+        # Databases without timezone support hand back naive datetimes
+        if isinstance(current, datetime) and isinstance(wanted, datetime) and current.tzinfo is None:
+            wanted = wanted.replace(tzinfo=None)
+        if current != wanted:
+            return False
+    return True
+
+def sync_media_items(db: Session, crawl: Dict[str, Optional[List[Dict]]]) -> Dict:
+    """Apply an album crawl to the table as a delta.
+    
+    Only categories that were crawled completely are touched: new items are
+    inserted, changed ones updated and items no longer in the album deleted.
+    Categories that failed (None) keep their previous rows. Rows of
+    categories missing from the crawl (album no longer configured) are
+    purged.
+    """
+    complete = {category: photos for category, photos in crawl.items() if photos is not None}
+    stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "purged": 0, "skippedCategories": [
+        category for category, photos in crawl.items() if photos is None
+    ]}
+    stats["purged"] = db.query(GoogleMediaItem).filter(
+        GoogleMediaItem.category.notin_(list(crawl))
+    ).delete(synchronize_session=False)
+    if not complete:
+        db.commit()
+        return stats
+    
+    now = datetime.now(timezone.utc)
+    existing = {
+        (row.media_item_id, row.category): row
+        for row in db.query(GoogleMediaItem).filter(GoogleMediaItem.category.in_(list(complete)))
+    }
+    
+    seen = set()
+    for category, photos in complete.items():
+        for position, photo in enumerate(photos):
+            key = (photo["id"], category)
+            if key in seen:
+                continue
+            seen.add(key)
+            values = _row_values(photo, position)
+            row = existing.get(key)
+            if row is None:
+                db.add(GoogleMediaItem(media_item_id=photo["id"], category=category, **values))
+                stats["inserted"] += 1
+            elif not _same(row, values):
+                for field, value in values.items():
+                    setattr(row, field, value)
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+    
+    for key, row in existing.items():
+        if key not in seen:
+            db.delete(row)
+            stats["deleted"] += 1
+    
+    db.flush()
+    # One statement marks every confirmed row as seen by this crawl
+    db.query(GoogleMediaItem).filter(
+        GoogleMediaItem.category.in_(list(complete))
+    ).update({
+        GoogleMediaItem.synced_at: now,
+        # The crawl handed out a fresh baseUrl for every item
+        GoogleMediaItem.base_url_fetched_at: now,
+    }, synchronize_session=False)
+    db.commit()
+    return stats
+
+def get_media_items(db: Session, categories: List[str]) -> List[Dict]:
+    """Read the stored media items of the given categories in the album endpoint's format, in that order"""
+    rank = {category: index for index, category in enumerate(categories)}
+    rows = db.query(GoogleMediaItem).filter(
+        GoogleMediaItem.category.in_(categories)
+    ).order_by(GoogleMediaItem.category, GoogleMediaItem.position).all()
+    rows.sort(key=lambda row: (rank[row.category], row.position))
+    photos = []
+    for row in rows:
+        photo = {
+            "id": row.media_item_id,
+            "baseUrl": row.base_url,
+            "filename": row.filename,
+            "description": row.description or "",
+            "category": row.category,
+            "mediaMetadata": row.media_metadata or {},
+            "creationTime": (row.media_metadata or {}).get("creationTime")
+        }
+        if row.placeholder:
+            photo["placeholder"] = row.placeholder
+        photos.append(photo)
+    return photos
+
+def get_last_synced_at(db: Session) -> Optional[datetime]:
+    return db.query(func.max(GoogleMediaItem.synced_at)).scalar()
+
+def get_base_url_fetched_at(db: Session) -> Dict[str, float]:
+    """When each media item's stored baseUrl was issued, as POSIX timestamps"""
+    rows = db.query(
+        GoogleMediaItem.media_item_id,
+        func.min(GoogleMediaItem.base_url_fetched_at)
+    ).group_by(GoogleMediaItem.media_item_id).all()
+    fetched = {}
+    for media_item_id, fetched_at in rows:
+        if fetched_at is None:
+            continue
+        # Databases without timezone support hand back naive UTC datetimes
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        fetched[media_item_id] = fetched_at.timestamp()
+    return fetched
+
+def update_base_urls(db: Session, base_urls: Dict[str, str], fetched_at: datetime) -> int:
+    """Store refreshed baseUrls for every row of each media item"""
+    updated = 0
+    for media_item_id, base_url in base_urls.items():
+        updated += db.query(GoogleMediaItem).filter(
+            GoogleMediaItem.media_item_id == media_item_id
+        ).update({
+            GoogleMediaItem.base_url: base_url,
+            GoogleMediaItem.base_url_fetched_at: fetched_at,
+        }, synchronize_session=False)
+    db.commit()
+    return updated
+
+def update_placeholders(db: Session, placeholders: Dict[str, str]) -> int:
+    """Store rendered placeholders for every row of each media item"""
+    updated = 0
+    for media_item_id, placeholder in placeholders.items():
+        updated += db.query(GoogleMediaItem).filter(
+            GoogleMediaItem.media_item_id == media_item_id
+        ).update({GoogleMediaItem.placeholder: placeholder}, synchronize_session=False)
+    db.commit()
+    return updated
@@ -0,0 +1,91 @@
+# app/crud/crud_photo.py
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import Integer, cast, column, func, literal_column, or_, table
+from sqlalchemy.sql import ColumnElement
+from typing import Dict, List, Optional, Tuple
+import re
+from app.db.search_index import search_backend
+from app.models.photo import Photo
+from app.models.photo_category_stats import PhotoCategoryStats
+
+# Only this many words of a query reach the full-text matcher
+MAX_SEARCH_TERMS = 8
+
+# Relevance is scaled to an integer so it can sit in an exact keyset cursor
+RANK_SCALE = 1_000_000
+
+# SQLite FTS5 per-column weights: title, description, filename, category
+FTS5_WEIGHTS = (10.0, 2.0, 1.0, 4.0)
+
+photos_fts = table("photos_fts", column("rowid"))
+
+def search_terms(q: str) -> List[str]:
+    # Same word boundaries as the indexes: '_', '.', '-' separate words
+    return re.findall(r"[^\W_]+", q.lower())[:MAX_SEARCH_TERMS]
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def ilike_search(db: Session, q: str) -> Query:
+    """Unindexed substring match over every text column (the fallback path)"""
+    pattern = _like_pattern(q)
+    return db.query(Photo).filter(Photo.storage_type == 'local').filter(or_(
+        Photo.title.ilike(pattern, escape="\\"),
+        Photo.description.ilike(pattern, escape="\\"),
+        Photo.filename.ilike(pattern, escape="\\"),
+        Photo.category.ilike(pattern, escape="\\"),
+    ))
+
+def _postgres_search(db: Session, q: str, terms: List[str]) -> Tuple[Query, ColumnElement]:
+    # Every word must match, each as a prefix ("sun" finds "sunset")
+    tsquery = func.to_tsquery('simple', " & ".join(f"{term}:*" for term in terms))
+    vector = literal_column("photos.search_vector")
+    score = cast(
+        (func.ts_rank_cd(vector, tsquery) + func.similarity(Photo.filename, q)) * RANK_SCALE,
+        Integer,
+    )
+    query = db.query(Photo).filter(Photo.storage_type == 'local').filter(or_(
+        vector.op("@@")(tsquery),
+        # Typo-tolerant and substring filename matches, both served by the trigram index
+        Photo.filename.op("%")(q),
+        Photo.filename.ilike(_like_pattern(q), escape="\\"),
+    ))
+    return query, score
+
+def _sqlite_search(db: Session, q: str, terms: List[str]) -> Tuple[Query, ColumnElement]:
+    match = " ".join(f'"{term}"*' for term in terms)
+    fts = literal_column("photos_fts")
+    # bm25() is lower-is-better
+    score = cast(-func.bm25(fts, *FTS5_WEIGHTS) * RANK_SCALE, Integer)
+    query = db.query(Photo).join(photos_fts, photos_fts.c.rowid == Photo.id).filter(
+        Photo.storage_type == 'local'
+    ).filter(fts.op("MATCH")(match))
+    return query, score
+
+def search_photos(db: Session, q: str) -> Tuple[Query, Optional[ColumnElement], str]:
+    """Query for local photos matching `q`, its relevance score and the backend used.
+    
+    The score is None on the ilike fallback (no search index installed, or
+    no searchable words in `q`); results are then unranked.
+    """
+    terms = search_terms(q)
+    backend = search_backend(db.connection()) if terms else "ilike"
+    if backend == "postgresql":
+        return (*_postgres_search(db, q, terms), backend)
+    if backend == "sqlite":
+        return (*_sqlite_search(db, q, terms), backend)
+    return ilike_search(db, q), None, "ilike"
+
+def get_category_counts(db: Session, storage_type: str = 'local') -> Dict[str, int]:
+    """Photos per category from the trigger-maintained counters, by category name"""
+    rows = db.query(PhotoCategoryStats.category, PhotoCategoryStats.photo_count).filter(
+        PhotoCategoryStats.storage_type == storage_type,
+        PhotoCategoryStats.photo_count > 0
+    ).order_by(PhotoCategoryStats.category).all()
+    return dict(rows)
+
+def count_capped(query: Query, cap: int) -> Tuple[int, bool]:
+    """Count matches but stop after `cap`; returns (count, exact)"""
+    count = query.limit(cap + 1).count()
+    return min(count, cap), count <= cap
@@ -8,6 +8,10 @@ from app.db.base_class import Base
 from app.models.user import User  
 from app.models.project import Project
 from app.models.user_session import UserSession
+from app.models.google_media_item import GoogleMediaItem
+from app.models.album import Album
+from app.models.photo import Photo
+from app.models.photo_category_stats import PhotoCategoryStats
 
 # Create SQLAlchemy engine
 engine = create_engine(settings.DATABASE_URL)
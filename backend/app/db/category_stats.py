@@ -0,0 +1,104 @@
+# app/db/category_stats.py
+"""Triggers that keep photo_category_stats in step with the photos table.
+
+Every insert, delete, or storage_type/category change on photos adjusts
+the matching counter row in the same transaction, so the counts are
+exact without ever scanning photos. Installing also backfills the
+counters from the current rows. Idempotent, like app.db.search_index,
+so it runs from the Alembic migration and after `create_all` in
+scripts/migrate.sh.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+BACKFILL = [
+    "DELETE FROM photo_category_stats",
+    """
+    INSERT INTO photo_category_stats (storage_type, category, photo_count)
+    SELECT storage_type, category, count(*) FROM photos GROUP BY storage_type, category
+    """,
+]
+
+POSTGRES_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION photo_category_stats_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE photo_category_stats SET photo_count = photo_count - 1
+            WHERE storage_type = OLD.storage_type AND category = OLD.category;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO photo_category_stats (storage_type, category, photo_count)
+            VALUES (NEW.storage_type, NEW.category, 1)
+            ON CONFLICT (storage_type, category)
+            DO UPDATE SET photo_count = photo_category_stats.photo_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS photos_category_stats ON photos",
+    """
+    CREATE TRIGGER photos_category_stats
+    AFTER INSERT OR DELETE OR UPDATE OF storage_type, category ON photos
+    FOR EACH ROW EXECUTE FUNCTION photo_category_stats_apply()
+    """,
+    # Hold off writers until the backfill below has counted every row
+    "LOCK TABLE photos IN SHARE ROW EXCLUSIVE MODE",
+]
+
+POSTGRES_DROP = [
+    "DROP TRIGGER IF EXISTS photos_category_stats ON photos",
+    "DROP FUNCTION IF EXISTS photo_category_stats_apply()",
+]
+
+_SQLITE_INCREMENT = """
+        INSERT INTO photo_category_stats (storage_type, category, photo_count)
+        VALUES (new.storage_type, new.category, 1)
+        ON CONFLICT (storage_type, category) DO UPDATE SET photo_count = photo_count + 1;
+"""
+
+_SQLITE_DECREMENT = """
+        UPDATE photo_category_stats SET photo_count = photo_count - 1
+        WHERE storage_type = old.storage_type AND category = old.category;
+"""
+
+SQLITE_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS photos_category_stats_insert AFTER INSERT ON photos BEGIN
+        {_SQLITE_INCREMENT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS photos_category_stats_delete AFTER DELETE ON photos BEGIN
+        {_SQLITE_DECREMENT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS photos_category_stats_update
+    AFTER UPDATE OF storage_type, category ON photos BEGIN
+        {_SQLITE_DECREMENT}
+        {_SQLITE_INCREMENT}
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS photos_category_stats_update",
+    "DROP TRIGGER IF EXISTS photos_category_stats_delete",
+    "DROP TRIGGER IF EXISTS photos_category_stats_insert",
+]
+
+
+def install_category_stats(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    statements = POSTGRES_DDL if dialect == "postgresql" else SQLITE_DDL if dialect == "sqlite" else []
+    for statement in statements + BACKFILL:
+        connection.execute(text(statement))
+
+
+def remove_category_stats(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    statements = POSTGRES_DROP if dialect == "postgresql" else SQLITE_DROP if dialect == "sqlite" else []
+    for statement in statements:
+        connection.execute(text(statement))
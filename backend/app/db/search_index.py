@@ -0,0 +1,113 @@
+# app/db/search_index.py
+"""Full-text search structures for the photos table.
+
+PostgreSQL gets a generated, weighted tsvector column with a GIN index
+plus a pg_trgm index on filename; SQLite (local development) gets an
+external-content FTS5 table kept in sync by triggers. Everything here is
+idempotent so it can run from the Alembic migration as well as after
+`create_all` in scripts/migrate.sh.
+"""
+from typing import Dict
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+# Weighted document: title (A) > category (B) > description (C) > filename words (D)
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE photos ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', category), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('simple', translate(filename, '._-', '   ')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_photos_search_vector ON photos USING gin (search_vector)",
+    # Makes filename ILIKE '%...%' and similarity() index-assisted
+    "CREATE INDEX IF NOT EXISTS ix_photos_filename_trgm ON photos USING gin (filename gin_trgm_ops)",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_photos_filename_trgm",
+    "DROP INDEX IF EXISTS ix_photos_search_vector",
+    "ALTER TABLE photos DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS photos_fts USING fts5(
+        title, description, filename, category,
+        content='photos', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS photos_fts_insert AFTER INSERT ON photos BEGIN
+        INSERT INTO photos_fts(rowid, title, description, filename, category)
+        VALUES (new.id, new.title, new.description, new.filename, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS photos_fts_delete AFTER DELETE ON photos BEGIN
+        INSERT INTO photos_fts(photos_fts, rowid, title, description, filename, category)
+        VALUES ('delete', old.id, old.title, old.description, old.filename, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS photos_fts_update AFTER UPDATE ON photos BEGIN
+        INSERT INTO photos_fts(photos_fts, rowid, title, description, filename, category)
+        VALUES ('delete', old.id, old.title, old.description, old.filename, old.category);
+        INSERT INTO photos_fts(rowid, title, description, filename, category)
+        VALUES (new.id, new.title, new.description, new.filename, new.category);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS photos_fts_update",
+    "DROP TRIGGER IF EXISTS photos_fts_delete",
+    "DROP TRIGGER IF EXISTS photos_fts_insert",
+    "DROP TABLE IF EXISTS photos_fts",
+]
+
+# Search backend per database URL, detected once
+_backends: Dict[str, str] = {}
+
+
+def install_search_index(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        existed = "photos_fts" in inspect(connection).get_table_names()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            # Index the rows that predate the triggers
+            connection.execute(text("INSERT INTO photos_fts(photos_fts) VALUES ('rebuild')"))
+    _backends.pop(str(connection.engine.url), None)
+
+
+def remove_search_index(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    statements = POSTGRES_DROP if dialect == "postgresql" else SQLITE_DROP if dialect == "sqlite" else []
+    for statement in statements:
+        connection.execute(text(statement))
+    _backends.pop(str(connection.engine.url), None)
+
+
+def search_backend(connection: Connection) -> str:
+    """"postgresql", "sqlite" (FTS5) or "ilike" when no search index is installed"""
+    key = str(connection.engine.url)
+    if key not in _backends:
+        dialect = connection.dialect.name
+        backend = "ilike"
+        if dialect == "postgresql":
+            columns = {column["name"] for column in inspect(connection).get_columns("photos")}
+            if "search_vector" in columns:
+                backend = "postgresql"
+        elif dialect == "sqlite" and "photos_fts" in inspect(connection).get_table_names():
+            backend = "sqlite"
+        _backends[key] = backend
+    return _backends[key]
@@ -10,6 +10,21 @@ from app.db.session import SessionLocal
 from app.db.init_db import init_db
 from app.db.utils import test_db_connection
 from app.middleware.security import setup_security
+from app.middleware.compression import CompressionMiddleware
+from app.core.http_client import init_http_client, close_http_client
+from app.core.image_cache import image_cache
+from app.core.image_variants import shutdown_process_pool
+from app.core.thumbnail_prewarm import thumbnail_prewarmer
+from app.api.v1.endpoints.local_photos import placeholder_worker as local_placeholder_worker
+from starlette.concurrency import run_in_threadpool
+from app.api.v1.endpoints.photos import (
+    google_photos_service,
+    placeholder_worker,
+    load_photos_cache_from_db,
+    start_photos_cache_sync,
+    stop_placeholder_publishing,
+    stop_photos_cache_sync,
+)
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 from contextlib import asynccontextmanager
@@ -35,10 +50,25 @@ async def lifespan(app: FastAPI):
     logger.info("App startup - initializing cache...")
     FastAPICache.init(InMemoryBackend(), prefix="vadimcastro-cache")
     logger.info("Cache initialized successfully")
+    await init_http_client()
+    await run_in_threadpool(image_cache.load)
+    image_cache.start_rescans()
+    google_photos_service.start_token_renewal()
+    start_photos_cache_sync()
+    await load_photos_cache_from_db()
     
     yield
     
     # Cleanup
+    await stop_photos_cache_sync()
+    await thumbnail_prewarmer.stop()
+    await image_cache.stop_rescans()
+    await placeholder_worker.stop()
+    await stop_placeholder_publishing()
+    await local_placeholder_worker.stop()
+    await google_photos_service.stop_token_renewal()
+    await close_http_client()
+    shutdown_process_pool()
     logger.info("App shutdown")
 
 app = FastAPI(
@@ -69,6 +99,9 @@ app.add_middleware(
 )
 print("CORS middleware added directly")
 
+# gzip/brotli for JSON and text responses above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 # Add error handling middleware to ensure CORS headers on errors
 @app.middleware("http")
 async def add_cors_headers_on_error(request: Request, call_next):
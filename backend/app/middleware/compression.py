@@ -0,0 +1,102 @@
+# app/middleware/compression.py
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import compress, is_compressible, negotiate_encoding, stream_compressor, weaken_etag
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression for text and JSON bodies.
+    
+    Unlike Starlette's GZipMiddleware this negotiates brotli, leaves images,
+    partial (206) and already-encoded responses alone, and skips bodies
+    smaller than `minimum_size`.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+            if encoding:
+                await CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.process = None
+        self.finish = None
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+    
+    def _set_headers(self, content_length: int = None) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        if "etag" in headers:
+            headers["ETag"] = weaken_etag(headers["etag"])
+        headers.add_vary_header("Accept-Encoding")
+    
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk decides the headers
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            return
+        
+        if message["type"] != "http.response.body" or self.passthrough:
+            if not self.started and message["type"] == "http.response.body":
+                self.started = True
+                await self.send(self.start_message)
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if not self.started:
+            self.started = True
+            if not more_body:
+                if len(body) < self.minimum_size:
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                body = compress(body, self.encoding)
+                self._set_headers(len(body))
+                await self.send(self.start_message)
+                await self.send({**message, "body": body})
+                return
+            # Streaming body: compress chunk by chunk
+            self.process, self.finish = stream_compressor(self.encoding)
+            self._set_headers()
+            await self.send(self.start_message)
+        
+        if self.process is None:
+            # Small single-chunk body already sent uncompressed
+            await self.send(message)
+            return
+        chunk = self.process(body) if body else b""
+        if not more_body:
+            chunk += self.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
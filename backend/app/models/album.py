@@ -0,0 +1,23 @@
+# app/models/album.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Album(Base):
+    """A gallery category; local photos live under LOCAL_PHOTOS_DIR/<category>/"""
+    __tablename__ = "albums"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    storage_type = Column(String(20), nullable=False, default="local")
+    category = Column(String(100), nullable=False)
+    name = Column(String(255), nullable=False)
+    description = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    photos = relationship("Photo", back_populates="album")
+    
+    __table_args__ = (
+        UniqueConstraint("storage_type", "category", name="uq_albums_storage_category"),
+    )
@@ -0,0 +1,39 @@
+# app/models/google_media_item.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class GoogleMediaItem(Base):
+    """A Google Photos media item as last seen in one category album.
+    
+    The same media item can sit in several albums, so rows are unique per
+    (media_item_id, category) rather than per media item.
+    """
+    __tablename__ = "google_media_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    media_item_id = Column(String(255), nullable=False)
+    category = Column(String(100), nullable=False)
+    # Order within the album as returned by mediaItems:search
+    position = Column(Integer, nullable=False, default=0)
+    filename = Column(String(500), nullable=False)
+    description = Column(Text)
+    base_url = Column(Text, nullable=False)
+    # When base_url was issued; Google baseUrls expire after about an hour
+    base_url_fetched_at = Column(DateTime(timezone=True))
+    width = Column(Integer)
+    height = Column(Integer)
+    creation_time = Column(DateTime(timezone=True))
+    media_metadata = Column(JSON)
+    # Tiny inline preview (data URI) shown while the thumbnail loads
+    placeholder = Column(Text)
+    # Last crawl that confirmed this row
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("media_item_id", "category", name="uq_google_media_items_item_category"),
+        Index("ix_google_media_items_category_position", "category", "position"),
+        Index("ix_google_media_items_category_creation_time", "category", "creation_time"),
+    )
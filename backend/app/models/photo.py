@@ -0,0 +1,38 @@
+# app/models/photo.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Photo(Base):
+    """A photo served by the local photo endpoints.
+    
+    Every listing filters on storage_type, optionally on category, and
+    orders by (created_at, id); the composite indexes below match those
+    access paths so listings are index range scans at any table size.
+    """
+    __tablename__ = "photos"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    album_id = Column(Integer, ForeignKey("albums.id", ondelete="SET NULL"))
+    storage_type = Column(String(20), nullable=False, default="local")
+    category = Column(String(100), nullable=False)
+    filename = Column(String(500), nullable=False)
+    title = Column(String(255))
+    description = Column(Text)
+    width = Column(Integer)
+    height = Column(Integer)
+    file_size = Column(Integer)
+    mime_type = Column(String(100))
+    # Tiny inline preview (data URI) shown while the thumbnail loads
+    placeholder = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    album = relationship("Album", back_populates="photos")
+    
+    __table_args__ = (
+        UniqueConstraint("storage_type", "category", "filename", name="uq_photos_storage_category_filename"),
+        Index("ix_photos_storage_category_created_id", "storage_type", "category", "created_at", "id"),
+        Index("ix_photos_storage_created_id", "storage_type", "created_at", "id"),
+    )
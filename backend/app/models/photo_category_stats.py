@@ -0,0 +1,16 @@
+# app/models/photo_category_stats.py
+from sqlalchemy import Column, Integer, String
+from app.db.base_class import Base
+
+class PhotoCategoryStats(Base):
+    """Photo count per storage_type/category, kept current by triggers on photos.
+    
+    Listings read totals and the category list from here instead of
+    running count(*) and SELECT DISTINCT over photos on every request.
+    The triggers are installed by app.db.category_stats.
+    """
+    __tablename__ = "photo_category_stats"
+    
+    storage_type = Column(String(20), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    photo_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,78 @@
+"""Benchmark album listing serialisation at gallery scale.
+
+Compares the default FastAPI path (jsonable_encoder + json.dumps), plain
+orjson, and the per-snapshot pre-encoded body, plus the cost of gzip and
+brotli for the same payload.
+
+    python -m scripts.bench_album_json --photos 10000
+"""
+import argparse
+import json
+import time
+import zlib
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.api.v1.endpoints.photos import PhotosSnapshot
+from app.core.compression import brotli, compress
+
+
+def make_photos(count: int):
+    categories = ["portraits", "landscape", "street", "abstract", "wildlife"]
+    return [
+        {
+            "id": f"AGj1epX{i:012d}Zk2bQ",
+            "baseUrl": f"https://lh3.googleusercontent.com/lr/AAJ1LKd{i:08d}xQ3vTqYp9mRwE4zN",
+            "filename": f"IMG_{i:05d}.jpg",
+            "description": "" if i % 3 else f"Photo number {i}",
+            "category": categories[i % len(categories)],
+            "mediaMetadata": {
+                "creationTime": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00Z",
+                "width": "6000",
+                "height": "4000",
+                "photo": {"cameraMake": "FUJIFILM", "cameraModel": "X-T4", "focalLength": 35, "apertureFNumber": 2.0, "isoEquivalent": 400},
+            },
+            "creationTime": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label: str, fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    size = f"{len(result) / 1024:,.0f} KiB" if isinstance(result, (bytes, str)) else ""
+    print(f"{label:<40} {best * 1000:9.2f} ms  {size}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    photos = make_photos(args.photos)
+    print(f"{args.photos:,} photos, best of {args.repeat}\n")
+
+    timed("jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(photos)).encode(), args.repeat)
+    body = timed("orjson.dumps", lambda: orjson.dumps(photos), args.repeat)
+    snapshot = timed("snapshot build (indexes + ETag)", lambda: PhotosSnapshot(photos), args.repeat)
+    snapshot.encoded()
+    timed("pre-encoded body (per request)", lambda: snapshot.encoded().body, args.repeat)
+
+    print()
+    timed("gzip level 6", lambda: compress(body, "gzip"), args.repeat)
+    timed("gzip level 1", lambda: zlib.compress(body, 1), args.repeat)
+    if brotli is not None:
+        timed("brotli (configured quality)", lambda: compress(body, "br"), args.repeat)
+    else:
+        print("brotli not installed - skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark local photo listing serialisation: ORM objects vs projected rows.
+
+Builds a 1k-row page of GET /photos/local both ways against an in-memory
+SQLite database: the old path hydrating Photo objects and building each
+dict by hand, and the shared listing engine (column-projected row tuples,
+one row-mapper, orjson). Reports latency per 1k rows and the memory
+blocks allocated and still alive when the page reaches the encoder.
+
+    python -m scripts.bench_photo_listing --photos 10000 --page 1000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.photo_listing import LOCAL_IMAGE_URL, listing_query, photo_rows
+from app.db.base_class import Base
+from app.models.album import Album
+from app.models.photo import Photo
+from scripts.explain_photo_queries import CATEGORIES
+
+
+def seed(db: Session, count: int) -> None:
+    base = datetime(2024, 1, 1)
+    db.execute(Photo.__table__.insert(), [
+        {
+            "storage_type": "local",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "filename": f"IMG_{i:06d}.jpg",
+            "title": f"Photo {i}" if i % 2 else None,
+            "description": "Evening light over the harbor" if i % 3 == 0 else None,
+            "width": 6000,
+            "height": 4000,
+            "created_at": base + timedelta(seconds=i),
+            "placeholder": "data:image/webp;base64,UklGRkIAAABXRUJQVlA4IDYAAADQAQCdASoUAA0APzmGu1OvKSWisAgB4CcJZQAAW+q+9Bpo4aAA/uvZ+YkAc4jvVTc7+oJAnAAA",
+        }
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def page_query(db: Session, size: int):
+    return db.query(Photo).filter(Photo.storage_type == 'local').order_by(
+        Photo.created_at.desc(), Photo.id.desc()
+    ).limit(size)
+
+
+def orm_page(db: Session, size: int):
+    """The handlers before the listing engine: full Photo objects, dict built per field"""
+    photos = page_query(db, size).all()
+    photo_data = []
+    for photo in photos:
+        photo_data.append({
+            "id": str(photo.id),
+            "category": photo.category,
+            "filename": photo.filename,
+            "description": photo.description or photo.title or photo.filename,
+            "baseUrl": f"/photos/{photo.category}/{photo.filename}",
+            "imageUrl": LOCAL_IMAGE_URL.format(category=photo.category, filename=quote(photo.filename)),
+            "width": photo.width or 800,
+            "height": photo.height or 600,
+            "creationTime": photo.created_at.isoformat() if photo.created_at else None,
+            "placeholder": photo.placeholder
+        })
+    return photos, photo_data
+
+
+def projected_page(db: Session, size: int):
+    rows = listing_query(page_query(db, size)).all()
+    return rows, photo_rows(rows)
+
+
+def measure(label: str, build, db: Session, size: int, repeat: int) -> bytes:
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        started = time.perf_counter()
+        _, data = build(db, size)
+        body = orjson.dumps({"photos": data})
+        best = min(best, time.perf_counter() - started)
+
+    db.expunge_all()
+    tracemalloc.start()
+    # Objects built for the page, still referenced when it is handed to the encoder
+    fetched = build(db, size)
+    snapshot = tracemalloc.take_snapshot()
+    orjson.dumps({"photos": fetched[1]})
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del fetched
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    per_1k = 1000 / size
+    print(f"{label:<28} {best * 1000 * per_1k:8.2f} ms  {blocks * per_1k:>9,.0f} blocks  {peak * per_1k / 1024:>8,.0f} KiB peak  per 1k rows")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Album.__table__, Photo.__table__])
+    with Session(engine) as db:
+        seed(db, args.photos)
+        print(f"{args.photos:,} photos, {args.page:,}-row page, best of {args.repeat}\n")
+        before = measure("ORM objects + dict loop", orm_page, db, args.page, args.repeat)
+        after = measure("projected rows + row-mapper", projected_page, db, args.page, args.repeat)
+        assert orjson.loads(before) == orjson.loads(after), "listing output changed"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark /photos/local/search: ilike scan vs the full-text search index.
+
+Seeds the photos table inside a transaction that is rolled back afterwards,
+installs the search index (tsvector + pg_trgm on PostgreSQL, FTS5 on
+SQLite), then times the first page plus total count for a handful of
+queries on both paths, the way the endpoint runs them.
+
+    python -m scripts.bench_photo_search --rows 100000 1000000
+    DATABASE_URL=sqlite:////tmp/photos.db python -m scripts.bench_photo_search
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.local_photos import _fetch_page
+from app.crud.crud_photo import ilike_search, search_photos
+from app.db.base_class import Base
+from app.db.search_index import install_search_index
+from app.models.album import Album
+from app.models.photo import Photo
+from scripts.explain_photo_queries import CATEGORIES, database_url
+
+WORDS = [
+    "sunset", "harbor", "mountain", "river", "portrait", "city", "night", "forest",
+    "beach", "winter", "summer", "market", "bridge", "street", "garden", "desert",
+    "storm", "light", "shadow", "window", "train", "station", "festival", "lake",
+    "cliff", "valley", "morning", "evening", "fog", "snow", "rain", "cathedral",
+    "alley", "rooftop", "harvest", "meadow", "canyon", "island", "lantern", "pier",
+]
+
+QUERIES = ["sunset", "harbor forest", "img_4242", "cathedr", "nothingmatches"]
+
+
+def seed(connection, rows: int) -> None:
+    categories = ", ".join(f"'{category}'" for category in CATEGORIES)
+    words = ", ".join(f"'{word}'" for word in WORDS)
+    if connection.dialect.name == "postgresql":
+        pick = lambda expr: f"(ARRAY[{words}])[1 + ({expr}) % {len(WORDS)}]"
+        connection.execute(text(f"""
+            INSERT INTO photos (storage_type, category, filename, title, description, created_at)
+            SELECT 'local',
+                   (ARRAY[{categories}])[1 + n % {len(CATEGORIES)}],
+                   'IMG_' || n || '.jpg',
+                   {pick("n")} || ' ' || {pick("n * 7")},
+                   {pick("n * 13")} || ' ' || {pick("n * 17")} || ' ' || {pick("n * 31")},
+                   now() - n * interval '1 second'
+            FROM generate_series(1, :rows) AS n
+        """), {"rows": rows})
+    else:
+        # Statement must start with INSERT for pysqlite to open the transaction we roll back
+        as_json = lambda values: values.replace("'", '"')
+        pick = lambda expr: f"json_extract('[{as_json(words)}]', '$[' || (({expr}) % {len(WORDS)}) || ']')"
+        connection.execute(text(f"""
+            INSERT INTO photos (storage_type, category, filename, title, description, created_at)
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows)
+            SELECT 'local',
+                   json_extract('[{as_json(categories)}]', '$[' || (n % {len(CATEGORIES)}) || ']'),
+                   'IMG_' || n || '.jpg',
+                   {pick("n")} || ' ' || {pick("n * 7")},
+                   {pick("n * 13")} || ' ' || {pick("n * 17")} || ' ' || {pick("n * 31")},
+                   datetime('now', '-' || n || ' seconds')
+            FROM seq
+        """), {"rows": rows})
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def first_page(query, score=None):
+    photos, _ = _fetch_page(query, 50, None, score)
+    return len(photos), query.count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(database_url())
+    Base.metadata.create_all(engine, tables=[Album.__table__, Photo.__table__])
+    for rows in args.rows:
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            try:
+                started = time.perf_counter()
+                seed(connection, rows)
+                install_search_index(connection)
+                connection.execute(text("ANALYZE photos" if connection.dialect.name == "postgresql" else "ANALYZE"))
+                print(f"{rows:,} rows seeded and indexed in {time.perf_counter() - started:.1f}s ({connection.dialect.name}), best of {args.repeat}")
+                print(f"{'query':<18} {'ilike':>12} {'search':>12} {'matches':>16}")
+
+                db = Session(bind=connection)
+                for q in QUERIES:
+                    ilike_time, (_, ilike_total) = timed(lambda: first_page(ilike_search(db, q)), args.repeat)
+                    query, score, backend = search_photos(db, q)
+                    search_time, (_, search_total) = timed(lambda: first_page(query, score), args.repeat)
+                    print(f"{q:<18} {ilike_time * 1000:9.1f} ms {search_time * 1000:9.1f} ms {ilike_total:>7,} / {search_total:<7,} ({backend})")
+                print()
+                db.close()
+            finally:
+                transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
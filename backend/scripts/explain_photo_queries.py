@@ -0,0 +1,128 @@
+"""Check that local photo listings use the composite indexes, not a full scan.
+
+Seeds the photos table inside a transaction that is rolled back afterwards,
+refreshes planner statistics, then EXPLAINs the listing and category
+queries the local photo endpoints issue. Exits non-zero if either plan
+scans the whole table.
+
+    python -m scripts.explain_photo_queries --rows 1000000
+    DATABASE_URL=sqlite:////tmp/photos.db python -m scripts.explain_photo_queries
+
+Works against PostgreSQL (EXPLAIN) and SQLite (EXPLAIN QUERY PLAN).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from sqlalchemy import create_engine, literal_column, text, tuple_
+from sqlalchemy.orm import Query
+
+from app.db.base_class import Base
+from app.models.album import Album
+from app.models.photo import Photo
+
+CATEGORIES = ["portraits", "landscape", "street", "abstract", "wildlife"]
+
+
+def database_url() -> str:
+    if os.getenv("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
+    from app.core.config import settings
+    return settings.DATABASE_URL
+
+
+def listing_queries():
+    """The statements behind GET /photos/local, ?category=... and ?cursor=..."""
+    listing = Query(Photo).filter(Photo.storage_type == "local")
+    category = listing.filter(Photo.category == "street")
+    newest_first = (Photo.created_at.desc(), Photo.id.desc())
+    # A deep keyset page: starts after a (created_at, id) cursor instead of an OFFSET
+    after_cursor = tuple_(Photo.created_at, Photo.id) < tuple_(literal_column("'2020-01-01 00:00:00'"), literal_column("500000"))
+    return {
+        "listing": listing.order_by(*newest_first).limit(200),
+        "category": category.order_by(*newest_first).limit(200),
+        "keyset page": listing.filter(after_cursor).order_by(*newest_first).limit(200),
+    }
+
+
+def seed(connection, rows: int) -> None:
+    categories = ", ".join(f"'{category}'" for category in CATEGORIES)
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(f"""
+            INSERT INTO photos (storage_type, category, filename, created_at)
+            SELECT 'local',
+                   (ARRAY[{categories}])[1 + n % {len(CATEGORIES)}],
+                   'seed_' || n || '.jpg',
+                   now() - n * interval '1 second'
+            FROM generate_series(1, :rows) AS n
+        """), {"rows": rows})
+        connection.execute(text("ANALYZE photos"))
+    else:
+        # Statement must start with INSERT for pysqlite to open the transaction we roll back
+        connection.execute(text(f"""
+            INSERT INTO photos (storage_type, category, filename, created_at)
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows)
+            SELECT 'local',
+                   json_extract('[{categories.replace("'", '"')}]', '$[' || (n % {len(CATEGORIES)}) || ']'),
+                   'seed_' || n || '.jpg',
+                   datetime('now', '-' || n || ' seconds')
+            FROM seq
+        """), {"rows": rows})
+        connection.execute(text("ANALYZE"))
+
+
+def full_scans(connection, statement: str):
+    """Plan lines that read the whole photos table"""
+    if connection.dialect.name == "postgresql":
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        found, lines = [], []
+
+        def walk(node, depth=0):
+            lines.append("  " * depth + f"{node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}".rstrip())
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "photos":
+                found.append(node["Node Type"])
+            for child in node.get("Plans", []):
+                walk(child, depth + 1)
+
+        walk(plan[0]["Plan"])
+        return found, lines
+
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+    lines = [row[-1] for row in rows]
+    found = [line for line in lines if line.startswith("SCAN photos") and "USING" not in line]
+    return found, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    engine = create_engine(database_url())
+    Base.metadata.create_all(engine, tables=[Album.__table__, Photo.__table__])
+    failed = False
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            started = time.perf_counter()
+            seed(connection, args.rows)
+            print(f"Seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s ({connection.dialect.name})\n")
+
+            for name, query in listing_queries().items():
+                statement = str(query.statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+                scans, plan = full_scans(connection, statement)
+                print(f"{name}: {'FULL SCAN' if scans else 'ok'}")
+                for line in plan:
+                    print(f"    {line}")
+                failed = failed or bool(scans)
+        finally:
+            transaction.rollback()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,10 @@ sys.path.append('/app')
 from app.models.user import User
 from app.models.project import Project  
 from app.models.user_session import UserSession
+from app.models.google_media_item import GoogleMediaItem
+from app.models.album import Album
+from app.models.photo import Photo
+from app.models.photo_category_stats import PhotoCategoryStats
 from app.db.base_class import Base
 from app.db.session import engine
 import logging
@@ -67,6 +71,18 @@ try:
     Base.metadata.create_all(bind=engine)
     print('✅ Tables created successfully!')
     
+    # Full-text search column and indexes (not part of the models)
+    from app.db.search_index import install_search_index
+    with engine.begin() as connection:
+        install_search_index(connection)
+    print('✅ Search index installed!')
+    
+    # Per-category photo counters maintained by triggers
+    from app.db.category_stats import install_category_stats
+    with engine.begin() as connection:
+        install_category_stats(connection)
+    print('✅ Category stats installed!')
+    
     # Verify tables exist
     from sqlalchemy import inspect
     inspector = inspect(engine)